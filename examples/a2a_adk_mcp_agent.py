@@ -4,6 +4,10 @@
 Run this file once to start the policy, research, provider, and healthcare
 agents. The process then stays alive, reading prompts from stdin and writing
 responses to stdout.
+
+Set ``DEMO_MAX_INFLIGHT`` above 1 to pipeline prompts: up to that many are
+answered concurrently, each in its own conversation, and every response is
+written as soon as it is ready, tagged with its request id (``[#3] ...``).
 """
 
 from __future__ import annotations
@@ -11,14 +15,16 @@ from __future__ import annotations
 import asyncio
 import os
 import signal
-import socket
 import subprocess
 import sys
 import time
+from collections.abc import AsyncIterator, Callable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+import httpx
+from a2a.types import AgentCard
 from beeai_framework.adapters.a2a.agents import A2AAgent
 from beeai_framework.memory import UnconstrainedMemory
 from beeai_framework.middleware.trajectory import EventMeta, GlobalTrajectoryMiddleware
@@ -53,6 +59,12 @@ DEFAULT_PORTS = {
     "HEALTHCARE_AGENT_PORT": 9996,
 }
 
+# An agent is ready once it serves its AgentCard, not merely once its port is
+# open. Current A2A servers publish agent-card.json; older ones agent.json.
+AGENT_CARD_PATHS = ("/.well-known/agent-card.json", "/.well-known/agent.json")
+READINESS_TIMEOUT_S = 45.0
+READINESS_POLL_S = 0.1
+
 
 class ConciseGlobalTrajectoryMiddleware(GlobalTrajectoryMiddleware):
     """Keep trajectory logging concise while preserving event prefixes."""
@@ -85,21 +97,100 @@ class DemoStack:
 
         raise RuntimeError(f"Missing required environment variable: {port_env}")
 
-    def _is_port_open(self, host: str, port: int) -> bool:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            sock.settimeout(0.25)
-            return sock.connect_ex((host, port)) == 0
+    def _launch(
+        self, agent: ManagedAgent, launch_env: dict[str, str]
+    ) -> tuple[subprocess.Popen[str], float]:
+        port = self._port_for(agent.port_env)
+        proc = subprocess.Popen(
+            ["uv", "run", agent.script],
+            cwd=self.examples_dir,
+            env=launch_env,
+            stdout=None,
+            stderr=None,
+            text=True,
+        )
+        self.processes.append(proc)
+        print(f"  • launched {agent.name} on port {port} (pid={proc.pid})", flush=True)
+        return proc, time.perf_counter()
 
-    def _wait_for_port(self, host: str, port: int, timeout_s: float = 45.0) -> None:
-        deadline = time.time() + timeout_s
-        while time.time() < deadline:
-            if self._is_port_open(host, port):
-                return
-            time.sleep(0.25)
-        raise TimeoutError(f"Timed out waiting for {host}:{port} to become ready")
+    async def _agent_card_served(self, client: httpx.AsyncClient, port: int) -> bool:
+        for path in AGENT_CARD_PATHS:
+            try:
+                response = await client.get(f"http://{self.host}:{port}{path}")
+            except httpx.TransportError:
+                return False
+            if response.status_code != httpx.codes.OK:
+                continue
+            try:
+                card = response.json()
+            except ValueError:
+                return False
+            # Anything but a JSON object is not a card yet, not a failed start.
+            return isinstance(card, dict) and bool(card.get("name"))
+        return False
+
+    async def _wait_until_ready(
+        self,
+        client: httpx.AsyncClient,
+        agent: ManagedAgent,
+        proc: subprocess.Popen[str],
+        launched_at: float,
+        timeout_s: float = READINESS_TIMEOUT_S,
+    ) -> float:
+        """Polls the agent's AgentCard endpoint until it answers.
+
+        Args:
+            client: Shared HTTP client used for the probes.
+            agent: The agent being waited on.
+            proc: The agent's process, checked so a crash fails fast.
+            launched_at: ``time.perf_counter()`` value taken at launch.
+            timeout_s: How long to wait before giving up.
+
+        Returns:
+            Seconds from launch until the AgentCard was served.
+
+        Raises:
+            RuntimeError: If the process exits before it becomes ready.
+            TimeoutError: If the AgentCard is not served within ``timeout_s``.
+        """
+        port = self._port_for(agent.port_env)
+        deadline = launched_at + timeout_s
+        while time.perf_counter() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(
+                    f"{agent.name} exited with code {proc.returncode} before it was ready"
+                )
+            if await self._agent_card_served(client, port):
+                elapsed = time.perf_counter() - launched_at
+                print(
+                    f"  ✓ {agent.name} is ready at http://{self.host}:{port} "
+                    f"({elapsed:.2f}s)",
+                    flush=True,
+                )
+                return elapsed
+            await asyncio.sleep(READINESS_POLL_S)
+        raise TimeoutError(
+            f"Timed out waiting for {agent.name} at {self.host}:{port} to serve its AgentCard"
+        )
 
-    def start_all(self) -> None:
+    async def start_all(self) -> dict[str, float]:
+        """Launches every agent and waits until each one serves its AgentCard.
+
+        The dependency agents start together and are probed concurrently; the
+        healthcare agent starts once all of them are ready, because it fetches
+        their AgentCards on startup.
+
+        Returns:
+            Seconds from launch to readiness per agent name, plus ``"total"``
+            for the whole cold start.
+
+        Raises:
+            RuntimeError: If an agent exits before it becomes ready.
+            TimeoutError: If an agent does not serve its AgentCard in time.
+                The remaining probes are cancelled first.
+        """
         print("Starting all A2A healthcare demo agents...", flush=True)
+        started = time.perf_counter()
         launch_env = os.environ.copy()
         launch_env.setdefault("AGENT_HOST", self.host)
         for key, value in DEFAULT_PORTS.items():
@@ -112,45 +203,35 @@ class DemoStack:
             agent for agent in AGENTS if agent.port_env != "HEALTHCARE_AGENT_PORT"
         ]
 
-        for agent in dependency_agents:
-            port = self._port_for(agent.port_env)
-            proc = subprocess.Popen(
-                ["uv", "run", agent.script],
-                cwd=self.examples_dir,
-                env=launch_env,
-                stdout=None,
-                stderr=None,
-                text=True,
+        timings: dict[str, float] = {}
+        async with httpx.AsyncClient(timeout=1.0) as client:
+            launched = [(agent, *self._launch(agent, launch_env)) for agent in dependency_agents]
+            probes = [
+                asyncio.create_task(self._wait_until_ready(client, agent, proc, launched_at))
+                for agent, proc, launched_at in launched
+            ]
+            try:
+                ready = await asyncio.gather(*probes)
+            except BaseException:
+                # Stop the other probes before the caller runs stop_all, so
+                # none keeps polling an agent that is being shut down.
+                for probe in probes:
+                    probe.cancel()
+                await asyncio.gather(*probes, return_exceptions=True)
+                raise
+            timings.update(
+                (agent.name, elapsed)
+                for agent, elapsed in zip(dependency_agents, ready, strict=True)
             )
-            self.processes.append(proc)
-            print(f"  • launched {agent.name} on port {port} (pid={proc.pid})", flush=True)
 
-        for agent in dependency_agents:
-            port = self._port_for(agent.port_env)
-            self._wait_for_port(self.host, port)
-            print(f"  ✓ {agent.name} is ready at http://{self.host}:{port}", flush=True)
-
-        healthcare_port = self._port_for(healthcare_agent.port_env)
-        healthcare_proc = subprocess.Popen(
-            ["uv", "run", healthcare_agent.script],
-            cwd=self.examples_dir,
-            env=launch_env,
-            stdout=None,
-            stderr=None,
-            text=True,
-        )
-        self.processes.append(healthcare_proc)
-        print(
-            f"  • launched {healthcare_agent.name} on port {healthcare_port} "
-            f"(pid={healthcare_proc.pid})",
-            flush=True,
-        )
+            proc, launched_at = self._launch(healthcare_agent, launch_env)
+            timings[healthcare_agent.name] = await self._wait_until_ready(
+                client, healthcare_agent, proc, launched_at
+            )
 
-        self._wait_for_port(self.host, healthcare_port)
-        print(
-            f"  ✓ {healthcare_agent.name} is ready at http://{self.host}:{healthcare_port}",
-            flush=True,
-        )
+        timings["total"] = time.perf_counter() - started
+        print(f"  ⏱️ cold start took {timings['total']:.2f}s", flush=True)
+        return timings
 
     def stop_all(self) -> None:
         if not self.processes:
@@ -170,23 +251,30 @@ class DemoStack:
 
         self.processes.clear()
 
-    async def _build_healthcare_agent(self) -> A2AAgent:
+    async def _build_healthcare_agent(
+        self, agent_card: AgentCard | None = None
+    ) -> A2AAgent:
         healthcare_port = self._port_for("HEALTHCARE_AGENT_PORT")
         healthcare_agent = A2AAgent(
             url=f"http://{self.host}:{healthcare_port}",
+            agent_card=agent_card,
             memory=UnconstrainedMemory(),
         )
-        await healthcare_agent.check_agent_exists()
+        if agent_card is None:
+            await healthcare_agent.check_agent_exists()
         return healthcare_agent
 
-    async def run_stdio_loop(self) -> None:
-        healthcare_agent = await self._build_healthcare_agent()
-        is_tty = sys.stdin.isatty()
-
-        print("\nAll agents are running.", flush=True)
-        if is_tty:
-            print("Enter prompts (type 'exit' or 'quit' to stop).", flush=True)
-
+    def _max_inflight(self) -> int:
+        value = os.getenv("DEMO_MAX_INFLIGHT", "1")
+        try:
+            return max(int(value), 1)
+        except ValueError:
+            raise RuntimeError(
+                f"DEMO_MAX_INFLIGHT must be an integer, got {value!r}"
+            ) from None
+
+    async def _read_prompts(self, is_tty: bool) -> AsyncIterator[str]:
+        """Yields non-empty prompts from stdin until EOF, 'exit' or 'quit'."""
         while True:
             try:
                 if is_tty:
@@ -208,7 +296,101 @@ class DemoStack:
                 continue
             if user_input.lower() in {"exit", "quit"}:
                 return
+            yield user_input
+
+    async def _answer(
+        self,
+        request_id: int,
+        prompt: str,
+        agent_card: AgentCard,
+        emit: Callable[[str], None],
+    ) -> None:
+        # A fresh agent per request gives every prompt its own memory, so
+        # concurrent conversations cannot leak into each other. Reusing the
+        # AgentCard skips a card fetch per request.
+        try:
+            healthcare_agent = await self._build_healthcare_agent(agent_card)
+            response = await healthcare_agent.run(prompt).middleware(
+                ConciseGlobalTrajectoryMiddleware()
+            )
+            text = response.last_message.text
+        except Exception as exc:  # noqa: BLE001 - report and keep serving
+            text = f"⚠️ Request failed: {exc}"
+        emit(f"[#{request_id}] {text}")
+
+    async def run_pipelined(
+        self,
+        prompts: AsyncIterator[str],
+        max_inflight: int,
+        emit: Callable[[str], None] | None = None,
+        agent_card: AgentCard | None = None,
+    ) -> None:
+        """Answers up to ``max_inflight`` prompts concurrently.
+
+        Prompts are numbered in arrival order and each response is emitted as
+        soon as it completes, tagged ``[#<id>]``. Reading pauses while
+        ``max_inflight`` requests are running. Returns once ``prompts`` is
+        exhausted and every request has been answered.
+
+        Args:
+            prompts: Source of prompts, e.g. :meth:`_read_prompts`.
+            max_inflight: Maximum number of requests in flight.
+            emit: Receives each tagged response; defaults to printing it.
+            agent_card: The healthcare agent's AgentCard; fetched once here
+                when omitted.
+        """
+        if emit is None:
+
+            def emit(line: str) -> None:
+                print(line, flush=True)
+
+        if agent_card is None:
+            agent_card = (await self._build_healthcare_agent()).agent_card
+        slots = asyncio.Semaphore(max_inflight)
+        in_flight: set[asyncio.Task[None]] = set()
+
+        async def answer_in_slot(request_id: int, prompt: str) -> None:
+            try:
+                await self._answer(request_id, prompt, agent_card, emit)
+            finally:
+                slots.release()
+
+        request_id = 0
+        async for prompt in prompts:
+            await slots.acquire()
+            request_id += 1
+            task = asyncio.create_task(answer_in_slot(request_id, prompt))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    async def run_stdio_loop(self) -> None:
+        max_inflight = self._max_inflight()
+        # Fetches the AgentCard once; pipelined mode reuses it for the fresh
+        # agent it builds per prompt.
+        healthcare_agent = await self._build_healthcare_agent()
+        is_tty = sys.stdin.isatty()
+
+        print("\nAll agents are running.", flush=True)
+        if is_tty:
+            print("Enter prompts (type 'exit' or 'quit' to stop).", flush=True)
+
+        if max_inflight > 1:
+            print(
+                f"Pipelined mode: up to {max_inflight} prompts in flight; "
+                "responses are tagged [#<request id>].",
+                flush=True,
+            )
+            await self.run_pipelined(
+                self._read_prompts(is_tty),
+                max_inflight,
+                agent_card=healthcare_agent.agent_card,
+            )
+            return
 
+        async for user_input in self._read_prompts(is_tty):
             response = await healthcare_agent.run(user_input).middleware(
                 ConciseGlobalTrajectoryMiddleware()
             )
@@ -226,7 +408,7 @@ def main() -> None:
     signal.signal(signal.SIGINT, _handle_signal)
 
     try:
-        stack.start_all()
+        asyncio.run(stack.start_all())
         asyncio.run(stack.run_stdio_loop())
     finally:
         stack.stop_all()
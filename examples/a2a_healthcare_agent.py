@@ -2,7 +2,6 @@ import asyncio
 import os
 from typing import Any
 
-from beeai_framework.adapters.a2a.agents import A2AAgent
 from beeai_framework.adapters.a2a.serve.server import A2AServer, A2AServerConfig
 from beeai_framework.adapters.gemini import GeminiChatModel
 from beeai_framework.adapters.vertexai import VertexAIChatModel  # noqa: F401
@@ -10,14 +9,15 @@ from beeai_framework.agents.requirement import RequirementAgent
 from beeai_framework.agents.requirement.requirements.conditional import (
     ConditionalRequirement,
 )
-from beeai_framework.memory import UnconstrainedMemory
 from beeai_framework.middleware.trajectory import EventMeta, GlobalTrajectoryMiddleware
-from beeai_framework.serve.utils import LRUMemoryManager
 from beeai_framework.tools import Tool
 from beeai_framework.tools.handoff import HandoffTool
 from beeai_framework.tools.think import ThinkTool
 
+from agent_discovery import discover_agents
+from handoff_transport import HandoffTransport, PooledA2AAgent
 from helpers import setup_env
+from session_memory import SessionMemory, SessionMemoryManager
 from skill_registry import build_instruction_block
 
 
@@ -44,29 +44,47 @@ def main() -> None:
     # Log only tool calls
     GlobalTrajectoryMiddleware(target=[Tool])
 
-    policy_agent = A2AAgent(
-        url=f"http://{host}:{policy_agent_port}", memory=UnconstrainedMemory()
+    # Fetch all AgentCards concurrently (or reuse cached ones) in one loop
+    agent_cards = asyncio.run(
+        discover_agents(
+            {
+                "policy": f"http://{host}:{policy_agent_port}",
+                "research": f"http://{host}:{research_agent_port}",
+                "provider": f"http://{host}:{provider_agent_port}",
+            }
+        )
+    )
+
+    # All handoffs share one pooled transport with per-agent limits and
+    # circuit breakers (see handoff_transport.py)
+    handoff_parameters = HandoffTransport.from_env().agent_parameters()
+
+    policy_agent = PooledA2AAgent(
+        agent_card=agent_cards["policy"],
+        memory=SessionMemory.from_env(),
+        parameters=handoff_parameters,
     )
-    # Run `check_agent_exists()` to fetch and populate AgentCard
-    asyncio.run(policy_agent.check_agent_exists())
     print("\tℹ️", f"{policy_agent.name} initialized")
 
-    research_agent = A2AAgent(
-        url=f"http://{host}:{research_agent_port}", memory=UnconstrainedMemory()
+    research_agent = PooledA2AAgent(
+        agent_card=agent_cards["research"],
+        memory=SessionMemory.from_env(),
+        parameters=handoff_parameters,
     )
-    asyncio.run(research_agent.check_agent_exists())
     print("\tℹ️", f"{research_agent.name} initialized")
 
-    provider_agent = A2AAgent(
-        url=f"http://{host}:{provider_agent_port}", memory=UnconstrainedMemory()
+    provider_agent = PooledA2AAgent(
+        agent_card=agent_cards["provider"],
+        memory=SessionMemory.from_env(),
+        parameters=handoff_parameters,
     )
-    asyncio.run(provider_agent.check_agent_exists())
     print("\tℹ️", f"{provider_agent.name} initialized")
 
     skill_instruction_block = build_instruction_block("healthcare")
 
     healthcare_agent = RequirementAgent(
         name="Healthcare Agent",
+        memory=SessionMemory.from_env(),
         description="A personal concierge for Healthcare Information, customized to your policy.",
         llm=GeminiChatModel(
             "gemini-3-flash-preview",
@@ -134,14 +152,19 @@ def main() -> None:
 
     print("\tℹ️", f"{healthcare_agent.meta.name} initialized")
 
-    # Register the agent with the A2A server and run the HTTP server
-    # we use LRU memory manager to keep limited amount of sessions in the memory
-    A2AServer(
-        config=A2AServerConfig(
-            port=healthcare_agent_port, protocol="jsonrpc", host=host
-        ),
-        memory_manager=LRUMemoryManager(maxsize=100),
-    ).register(healthcare_agent, send_trajectory=True).serve()
+    # Register the agent with the A2A server and run the HTTP server.
+    # Sessions are kept within a token and RAM budget and spill to SQLite
+    # (see session_memory.py)
+    memory_manager = SessionMemoryManager.from_env()
+    try:
+        A2AServer(
+            config=A2AServerConfig(
+                port=healthcare_agent_port, protocol="jsonrpc", host=host
+            ),
+            memory_manager=memory_manager,
+        ).register(healthcare_agent, send_trajectory=True).serve()
+    finally:
+        memory_manager.close()
 
 
 if __name__ == "__main__":
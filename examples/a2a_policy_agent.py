@@ -8,16 +8,22 @@ from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 from a2a.utils import new_agent_text_message
+from starlette.applications import Starlette
 
 from helpers import setup_env
-from policy_agent import PolicyAgent
-from skill_registry import build_instruction_block, get_skills
+from policy_agent import MODEL, PolicyAgent
+from response_cache import (
+    ERROR_METADATA_KEY,
+    CachedAgentExecutor,
+    ResponseCache,
+    cache_stats_route,
+)
+from skill_registry import get_skills, instruction_block
 
 
 class PolicyAgentExecutor(AgentExecutor):
     def __init__(self) -> None:
         self.agent = PolicyAgent()
-        self.skill_instruction_block = build_instruction_block("policy")
 
     async def execute(
         self,
@@ -25,9 +31,20 @@ class PolicyAgentExecutor(AgentExecutor):
         event_queue: EventQueue,
     ) -> None:
         prompt = context.get_user_input()
-        prompt_with_skills = f"{self.skill_instruction_block}\n\nUser request: {prompt}"
-        response = self.agent.answer_query(prompt_with_skills)
-        message = new_agent_text_message(response)
+        # Fetched per request so edits to the skill file apply without a restart.
+        skill_instruction_block = instruction_block("policy").text
+        prompt_with_skills = f"{skill_instruction_block}\n\nUser request: {prompt}"
+        try:
+            response = await self.agent.aanswer_query(prompt_with_skills, query=prompt)
+        except TimeoutError:
+            message = new_agent_text_message(
+                "The policy lookup timed out after "
+                f"{self.agent.request_timeout_s:g}s. Please try again."
+            )
+            # Flagged so the response cache does not serve it to later askers.
+            message.metadata = {ERROR_METADATA_KEY: True}
+        else:
+            message = new_agent_text_message(response)
         await event_queue.enqueue_event(message)
 
     async def cancel(
@@ -66,8 +83,16 @@ def main() -> None:
         skills=skills,
     )
 
+    policy_executor = PolicyAgentExecutor()
+    # The policy document is static, so answers can be reused for an hour.
+    cache = ResponseCache.from_env("policy", default_ttl_s=3600)
     request_handler = DefaultRequestHandler(
-        agent_executor=PolicyAgentExecutor(),
+        agent_executor=CachedAgentExecutor(
+            policy_executor,
+            cache,
+            skill_hash=lambda: instruction_block("policy").sha256,
+            model=MODEL,
+        ),
         task_store=InMemoryTaskStore(),
     )
 
@@ -76,7 +101,9 @@ def main() -> None:
         http_handler=request_handler,
     )
 
-    uvicorn.run(server.build(), host=HOST, port=PORT)
+    app = Starlette(routes=[cache_stats_route(cache)])
+    server.add_routes_to_app(app)
+    uvicorn.run(app, host=HOST, port=PORT)
 
 
 if __name__ == "__main__":
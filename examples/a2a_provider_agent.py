@@ -7,14 +7,25 @@ from a2a.types import (
     AgentSkill,
 )
 from langchain.agents import create_agent
+from langchain.agents.middleware import ModelRequest, dynamic_prompt
 from langchain_litellm import ChatLiteLLM
 from langchain_mcp_adapters.client import MultiServerMCPClient
-from langchain_mcp_adapters.sessions import StdioConnection
+from langchain_mcp_adapters.sessions import StdioConnection, StreamableHttpConnection
 from langgraph.graph.state import CompiledStateGraph
 from langgraph_a2a_server import A2AServer
 
 from helpers import setup_env
-from skill_registry import build_instruction_block, get_skills
+from skill_registry import get_skills, instruction_block
+
+SYSTEM_PROMPT = (
+    "Find and list healthcare providers using the find_healthcare_providers MCP Tool."
+)
+
+
+@dynamic_prompt
+def provider_prompt(request: ModelRequest) -> str:
+    """Built on every model call, so skill edits apply without a restart."""
+    return f"{SYSTEM_PROMPT}\n\n{instruction_block('provider').text}"
 
 
 def main() -> None:
@@ -24,16 +35,21 @@ def main() -> None:
     HOST = os.getenv("AGENT_HOST", "localhost")
     PORT = int(os.getenv("PROVIDER_AGENT_PORT"))
 
-    mcp_client = MultiServerMCPClient(
-        {
-            "find_healthcare_providers": StdioConnection(
-                transport="stdio",
-                command="uv",
-                args=["run", "mcpserver.py"],
-            )
-        }
-    )
-    skill_instruction_block = build_instruction_block("provider")
+    # A shared, already-running doctor server (mcpserver.py --transport
+    # streamable-http) skips the per-agent interpreter start and data load.
+    doctor_mcp_url = os.getenv("DOCTOR_MCP_URL")
+    if doctor_mcp_url:
+        connection = StreamableHttpConnection(
+            transport="streamable_http",
+            url=doctor_mcp_url,
+        )
+    else:
+        connection = StdioConnection(
+            transport="stdio",
+            command="uv",
+            args=["run", "mcpserver.py"],
+        )
+    mcp_client = MultiServerMCPClient({"find_healthcare_providers": connection})
 
     agent: CompiledStateGraph = create_agent(
         model=ChatLiteLLM(
@@ -44,10 +60,7 @@ def main() -> None:
         ),
         tools=asyncio.run(mcp_client.get_tools()),
         name="HealthcareProviderAgent",
-        system_prompt=(
-            "Find and list healthcare providers using the find_healthcare_providers MCP Tool.\n\n"
-            f"{skill_instruction_block}"
-        ),
+        middleware=[provider_prompt],
     )
 
     agent_card = AgentCard(
@@ -1,39 +1,91 @@
 import os
 
 import uvicorn
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from google.adk.a2a.executor.a2a_agent_executor import A2aAgentExecutor
+from google.adk.a2a.utils.agent_card_builder import AgentCardBuilder
 from google.adk.agents.llm_agent import LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
+from google.adk.auth.credential_service.in_memory_credential_service import (
+    InMemoryCredentialService,
+)
+from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+from google.adk.models.llm_request import LlmRequest
+from google.adk.runners import Runner
+from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.adk.tools import google_search
+from starlette.applications import Starlette
 
 from helpers import setup_env
-from skill_registry import build_instruction_block
+from response_cache import CachedAgentExecutor, ResponseCache, cache_stats_route
+from skill_registry import instruction_block
 
 setup_env()
 
 PORT = int(os.getenv("RESEARCH_AGENT_PORT"))
 HOST = os.getenv("AGENT_HOST")
+MODEL = "gemini-3-pro-preview"
+INSTRUCTION = (
+    "You are a healthcare research agent tasked with providing information about "
+    "health conditions. Use the google_search tool to find information on the web "
+    "about options, symptoms, treatments, and procedures. Cite your sources in your "
+    "responses. Output all of the information you find."
+)
 
 
-def main() -> None:
-    skill_instruction_block = build_instruction_block("research")
+def attach_skills(callback_context: CallbackContext, llm_request: LlmRequest) -> None:
+    """Appends the skill block on every model call, so skill edits apply without a restart."""
+    llm_request.append_instructions([instruction_block("research").text])
+
 
+def main() -> None:
     # Create the Agent
     root_agent = LlmAgent(
-        model="gemini-3-pro-preview",
+        model=MODEL,
         name="HealthResearchAgent",
         tools=[google_search],
         description="Provides healthcare information about symptoms, health conditions, treatments, and procedures using up-to-date web resources.",
-        instruction=(
-            "You are a healthcare research agent tasked with providing information about "
-            "health conditions. Use the google_search tool to find information on the web "
-            "about options, symptoms, treatments, and procedures. Cite your sources in your "
-            "responses. Output all of the information you find.\n\n"
-            f"{skill_instruction_block}"
+        instruction=INSTRUCTION,
+        before_model_callback=attach_skills,
+    )
+
+    # Make the agent A2A-compatible. This is what google.adk's to_a2a() does,
+    # spelled out so the executor can be wrapped with the response cache.
+    runner = Runner(
+        app_name=root_agent.name,
+        agent=root_agent,
+        artifact_service=InMemoryArtifactService(),
+        session_service=InMemorySessionService(),
+        memory_service=InMemoryMemoryService(),
+        credential_service=InMemoryCredentialService(),
+    )
+    # Web search results go stale, so research answers expire sooner.
+    cache = ResponseCache.from_env("research", default_ttl_s=900)
+    request_handler = DefaultRequestHandler(
+        agent_executor=CachedAgentExecutor(
+            A2aAgentExecutor(runner=runner),
+            cache,
+            skill_hash=lambda: instruction_block("research").sha256,
+            model=MODEL,
         ),
+        task_store=InMemoryTaskStore(),
     )
 
-    # Make the agent A2A-compatible
-    a2a_app = to_a2a(root_agent, host=HOST, port=PORT)
+    a2a_app = Starlette(routes=[cache_stats_route(cache)])
+
+    async def setup_a2a() -> None:
+        agent_card = await AgentCardBuilder(
+            agent=root_agent, rpc_url=f"http://{HOST}:{PORT}/"
+        ).build()
+        A2AStarletteApplication(
+            agent_card=agent_card,
+            http_handler=request_handler,
+        ).add_routes_to_app(a2a_app)
+
+    a2a_app.add_event_handler("startup", setup_a2a)
     print("Running Health Research Agent")
     uvicorn.run(a2a_app, host=HOST, port=PORT)
 
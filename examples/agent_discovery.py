@@ -0,0 +1,178 @@
+"""Concurrent AgentCard discovery with retries and an on-disk card cache.
+
+The concierge needs the AgentCards of its downstream agents before it can
+build its handoff tools. ``discover_agents`` fetches all of them at once in
+one event loop, over a shared HTTP client. Each lookup has its own timeout
+and is retried with exponential backoff, so one slow agent costs at most its
+own retry budget rather than blocking the others.
+
+Fetched cards are written to ``data/.cache/agent_cards.json``. On the next
+start, a cached card is used without any network lookup if it still passes
+validation: it parses as an ``AgentCard``, it is younger than the cache TTL,
+and it points at the same host and port as the configured URL.
+
+Configuration:
+
+    AGENT_DISCOVERY_TIMEOUT_S   Per-attempt timeout in seconds (default: 5).
+    AGENT_DISCOVERY_ATTEMPTS    Attempts per agent (default: 5).
+    AGENT_CARD_CACHE_TTL_S      Cached cards older than this are refetched;
+                                0 disables the cache (default: 3600).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+from a2a.client import A2ACardResolver, A2AClientHTTPError
+from a2a.types import AgentCard
+from a2a.utils import PREV_AGENT_CARD_WELL_KNOWN_PATH
+
+CARD_CACHE_PATH = Path("data/.cache/agent_cards.json")
+BACKOFF_INITIAL_S = 0.5
+BACKOFF_MAX_S = 8.0
+
+
+def _endpoint(url: str) -> tuple[str, str, int | None]:
+    parts = urlsplit(url)
+    return parts.scheme, (parts.hostname or "").lower(), parts.port
+
+
+class AgentCardCache:
+    """Fetched AgentCards keyed by agent base URL, stored as one JSON file."""
+
+    def __init__(self, path: Path, ttl_s: float) -> None:
+        self.path = path
+        self.ttl_s = ttl_s
+        self._entries: dict[str, dict[str, Any]] = {}
+        if ttl_s > 0:
+            try:
+                self._entries = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def get(self, url: str) -> AgentCard | None:
+        """Returns the cached card for ``url`` if it is still valid."""
+        entry = self._entries.get(url)
+        if not entry or time.time() - entry.get("fetched_at", 0) > self.ttl_s:
+            return None
+        try:
+            card = AgentCard.model_validate(entry["card"])
+        except (KeyError, ValueError):
+            return None
+        if _endpoint(card.url) != _endpoint(url):
+            return None
+        return card
+
+    def put(self, url: str, card: AgentCard) -> None:
+        self._entries[url] = {
+            "fetched_at": time.time(),
+            "card": card.model_dump(mode="json", exclude_none=True),
+        }
+
+    def save(self) -> None:
+        if self.ttl_s <= 0:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self._entries, indent=2), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+
+async def _get_agent_card(client: httpx.AsyncClient, url: str) -> AgentCard:
+    try:
+        return await A2ACardResolver(client, url).get_agent_card()
+    except A2AClientHTTPError as exc:
+        if exc.status_code != httpx.codes.NOT_FOUND:
+            raise
+    # Older A2A servers publish the card under the previous well-known path.
+    return await A2ACardResolver(
+        client, url, agent_card_path=PREV_AGENT_CARD_WELL_KNOWN_PATH
+    ).get_agent_card()
+
+
+async def fetch_agent_card(
+    client: httpx.AsyncClient,
+    url: str,
+    timeout_s: float,
+    attempts: int,
+) -> AgentCard:
+    """Fetches the AgentCard at ``url``, retrying with exponential backoff.
+
+    Raises:
+        RuntimeError: If every attempt failed or timed out.
+    """
+    delay_s = BACKOFF_INITIAL_S
+    last_error: Exception | None = None
+    for attempt in range(1, attempts + 1):
+        try:
+            async with asyncio.timeout(timeout_s):
+                return await _get_agent_card(client, url)
+        except Exception as exc:  # noqa: BLE001 - retried, then reported
+            last_error = exc
+        if attempt < attempts:
+            await asyncio.sleep(delay_s)
+            delay_s = min(delay_s * 2, BACKOFF_MAX_S)
+    raise RuntimeError(
+        f"No AgentCard at {url} after {attempts} attempts: {last_error!r}"
+    ) from last_error
+
+
+async def discover_agents(
+    urls: Mapping[str, str],
+    timeout_s: float | None = None,
+    attempts: int | None = None,
+    cache: AgentCardCache | None = None,
+) -> dict[str, AgentCard]:
+    """Resolves the AgentCard of every agent concurrently.
+
+    Args:
+        urls: Label -> agent base URL.
+        timeout_s: Per-attempt timeout; defaults to ``AGENT_DISCOVERY_TIMEOUT_S``.
+        attempts: Attempts per agent; defaults to ``AGENT_DISCOVERY_ATTEMPTS``.
+        cache: Card cache; defaults to ``CARD_CACHE_PATH`` with a TTL of
+            ``AGENT_CARD_CACHE_TTL_S``.
+
+    Returns:
+        Label -> AgentCard, for every label in ``urls``.
+
+    Raises:
+        RuntimeError: If any agent could not be discovered; the message lists
+            every failure.
+    """
+    timeout_s = timeout_s or float(os.getenv("AGENT_DISCOVERY_TIMEOUT_S", "5"))
+    attempts = attempts or int(os.getenv("AGENT_DISCOVERY_ATTEMPTS", "5"))
+    cache = cache or AgentCardCache(
+        CARD_CACHE_PATH, float(os.getenv("AGENT_CARD_CACHE_TTL_S", "3600"))
+    )
+
+    cards = {label: cache.get(url) for label, url in urls.items()}
+    missing = [label for label, card in cards.items() if card is None]
+    if missing:
+        async with httpx.AsyncClient() as client:
+            results = await asyncio.gather(
+                *(
+                    fetch_agent_card(client, urls[label], timeout_s, attempts)
+                    for label in missing
+                ),
+                return_exceptions=True,
+            )
+        failures = []
+        for label, result in zip(missing, results, strict=True):
+            if isinstance(result, BaseException):
+                failures.append(f"{label}: {result}")
+                continue
+            cards[label] = result
+            cache.put(urls[label], result)
+        cache.save()
+        if failures:
+            raise RuntimeError("Agent discovery failed:\n  " + "\n  ".join(failures))
+
+    return {label: card for label, card in cards.items() if card is not None}
@@ -0,0 +1,109 @@
+"""Shared helpers for the example benchmarks.
+
+Each benchmark reports a summary (median/min/max seconds) per metric and can
+compare it against a JSON baseline recorded earlier on the same machine, so a
+slowdown shows up as a non-zero exit status.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+from pathlib import Path
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+# Added to every allowance so millisecond-scale metrics do not flag jitter.
+ABSOLUTE_SLACK_S = 0.005
+
+
+def add_baseline_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the ``--baseline``/``--save-baseline``/``--tolerance`` options."""
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help=f"Baseline JSON file (default: {DEFAULT_BASELINE.name} next to this script)",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Record this run as the new baseline instead of comparing against it",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown of a median over the baseline, as a fraction (default: 0.25)",
+    )
+
+
+def summarize(samples: dict[str, list[float]]) -> dict[str, dict[str, float]]:
+    """Reduces raw samples to median/min/max per metric."""
+    return {
+        metric: {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+        }
+        for metric, values in samples.items()
+        if values
+    }
+
+
+def print_summary(title: str, summary: dict[str, dict[str, float]], unit: str = "s") -> None:
+    """Prints one aligned line per metric."""
+    print(title)
+    width = max((len(metric) for metric in summary), default=0)
+    for metric, stats in summary.items():
+        print(
+            f"  {metric:<{width}}  median {stats['median']:.3f}{unit}  "
+            f"min {stats['min']:.3f}{unit}  max {stats['max']:.3f}{unit}"
+        )
+
+
+def check_baseline(
+    name: str,
+    summary: dict[str, dict[str, float]],
+    args: argparse.Namespace,
+) -> int:
+    """Saves or compares ``summary`` under ``name`` in the baseline file.
+
+    Args:
+        name: Benchmark name; one baseline file holds several benchmarks.
+        summary: Output of :func:`summarize`.
+        args: Parsed options from :func:`add_baseline_arguments`.
+
+    Returns:
+        Process exit status: 1 if any median regressed beyond the tolerance.
+    """
+    baselines: dict[str, dict[str, dict[str, float]]] = {}
+    if args.baseline.exists():
+        baselines = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    if args.save_baseline:
+        baselines[name] = summary
+        args.baseline.write_text(json.dumps(baselines, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved baseline '{name}' to {args.baseline}")
+        return 0
+
+    recorded = baselines.get(name)
+    if recorded is None:
+        print(f"No baseline for '{name}' in {args.baseline}; run with --save-baseline first.")
+        return 0
+
+    regressions = []
+    for metric, stats in summary.items():
+        reference = recorded.get(metric, {}).get("median")
+        if not reference:
+            continue
+        ratio = stats["median"] / reference
+        print(f"  {metric}: {ratio:.2f}x baseline median ({reference:.3f})")
+        if stats["median"] > reference * (1 + args.tolerance) + ABSOLUTE_SLACK_S:
+            regressions.append(metric)
+
+    if regressions:
+        print(f"❌ Regression beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    print("✅ Within baseline tolerance")
+    return 0
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for the healthcare demo stack.
+
+Starts the policy, research, provider and healthcare agents through
+``DemoStack.start_all`` several times and reports how long each agent took to
+serve its AgentCard, plus the wall time of the whole start.
+
+    uv run benchmarks/cold_start.py --runs 5 --save-baseline   # record
+    uv run benchmarks/cold_start.py --runs 5                   # compare
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from a2a_adk_mcp_agent import DemoStack  # noqa: E402
+from bench_utils import (  # noqa: E402
+    add_baseline_arguments,
+    check_baseline,
+    print_summary,
+    summarize,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts to measure")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    samples: dict[str, list[float]] = defaultdict(list)
+    for run in range(1, args.runs + 1):
+        print(f"--- cold start {run}/{args.runs}")
+        stack = DemoStack()
+        try:
+            timings = asyncio.run(stack.start_all())
+        finally:
+            stack.stop_all()
+        for metric, seconds in timings.items():
+            samples[metric].append(seconds)
+
+    summary = summarize(samples)
+    print_summary(f"Cold start over {args.runs} run(s):", summary)
+    sys.exit(check_baseline("cold_start", summary, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Lookup benchmark for the indexed doctor directory.
+
+Generates a synthetic provider directory (500k doctors by default, seeded so
+runs are comparable) and times a fixed mix of ``list_doctors``-style
+searches two ways: a linear scan that case-folds every record on every call,
+as ``mcpserver.list_doctors`` used to, and ``DoctorDirectory.search``. It
+also reports the one-off index build time and checks that both paths return
+the same matches.
+
+    uv run benchmarks/doctor_lookup.py --doctors 500000 --save-baseline
+    uv run benchmarks/doctor_lookup.py --doctors 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_utils import (  # noqa: E402
+    add_baseline_arguments,
+    check_baseline,
+    print_summary,
+    summarize,
+)
+from doctor_directory import INDEXED_FIELDS, DoctorDirectory, index_key  # noqa: E402
+
+STATES = {
+    "CA": ["Los Angeles", "San Diego", "San Jose", "Fresno", "Oakland", "Springfield"],
+    "TX": ["Houston", "Austin", "Dallas", "San Antonio", "El Paso"],
+    "NY": ["New York", "Buffalo", "Rochester", "Albany", "Syracuse"],
+    "FL": ["Miami", "Orlando", "Tampa", "Jacksonville"],
+    "IL": ["Chicago", "Springfield", "Peoria", "Naperville"],
+    "MA": ["Boston", "Worcester", "Springfield", "Cambridge"],
+    "GA": ["Atlanta", "Savannah", "Augusta"],
+    "WA": ["Seattle", "Spokane", "Tacoma"],
+    "CO": ["Denver", "Boulder", "Aurora"],
+    "AZ": ["Phoenix", "Tucson", "Mesa"],
+}
+SPECIALTIES = [
+    "Cardiology",
+    "Pediatrics",
+    "Dermatology",
+    "Orthopedic Surgery",
+    "Internal Medicine",
+    "Neurology",
+    "Obstetrics & Gynecology",
+    "Emergency Medicine",
+    "Psychiatry",
+    "Oncology",
+    "Family Medicine",
+    "Endocrinology",
+]
+LANGUAGES = ["Spanish", "Mandarin", "Hindi", "Korean", "French", "Portuguese", "Arabic"]
+INSURERS = [
+    "Blue Cross Blue Shield",
+    "Aetna",
+    "Cigna",
+    "UnitedHealth",
+    "Medicare",
+    "Medicaid",
+    "Humana",
+    "Kaiser Permanente",
+]
+
+# (label, filters); values are deliberately mixed-case like user input.
+QUERIES: list[tuple[str, dict[str, Any]]] = [
+    ("state", {"state": "ca"}),
+    ("city+state", {"city": "springfield", "state": "IL"}),
+    ("specialty+state", {"specialty": "psychiatry", "state": "ma"}),
+    ("zip", {"zip_code": "30310"}),
+    (
+        "language+insurance+new",
+        {"language": "spanish", "insurance": "aetna", "accepts_new_patients": True},
+    ),
+    (
+        "city+specialty+language",
+        {"city": "Boston", "specialty": "Pediatrics", "language": "Portuguese"},
+    ),
+]
+
+
+def synthetic_doctors(count: int, seed: int = 7) -> list[dict[str, Any]]:
+    """Builds ``count`` records shaped like ``data/doctors.json``."""
+    rng = random.Random(seed)
+    states = list(STATES)
+    doctors = []
+    for number in range(1, count + 1):
+        state = rng.choice(states)
+        city = rng.choice(STATES[state])
+        doctors.append(
+            {
+                "id": f"DOC{number:07d}",
+                "name": f"Dr. Provider {number}",
+                "specialty": rng.choice(SPECIALTIES),
+                "address": {
+                    "street": f"{rng.randint(1, 9999)} Main Street",
+                    "city": city,
+                    "state": state,
+                    "zip_code": f"{30000 + rng.randrange(2000):05d}",
+                },
+                "phone": f"(555) 555-{number % 10000:04d}",
+                "email": f"provider{number}@example.com",
+                "years_experience": rng.randint(1, 40),
+                "board_certified": rng.random() < 0.9,
+                "languages": ["English", *rng.sample(LANGUAGES, rng.randint(0, 2))],
+                "accepts_new_patients": rng.random() < 0.6,
+                "insurance_accepted": rng.sample(INSURERS, rng.randint(2, 5)),
+            }
+        )
+    return doctors
+
+
+def linear_search(
+    doctors: list[dict[str, Any]], filters: dict[str, Any], offset: int, limit: int
+) -> tuple[int, list[dict[str, Any]]]:
+    """The pre-index approach: case-fold and compare every record per call."""
+    wanted = {field: index_key(value) for field, value in filters.items()}
+    matches = [
+        doc
+        for doc in doctors
+        if all(
+            value in {index_key(v) for v in INDEXED_FIELDS[field](doc)}
+            for field, value in wanted.items()
+        )
+    ]
+    return len(matches), matches[offset : offset + limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--doctors", type=int, default=500_000, help="Synthetic records")
+    parser.add_argument("--runs", type=int, default=5, help="Repetitions per query")
+    parser.add_argument("--limit", type=int, default=20, help="Page size")
+    parser.add_argument(
+        "--skip-linear", action="store_true", help="Only time the indexed path"
+    )
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    print(f"Generating {args.doctors} synthetic doctors...")
+    doctors = synthetic_doctors(args.doctors)
+
+    samples: dict[str, list[float]] = defaultdict(list)
+    started = time.perf_counter()
+    directory = DoctorDirectory(doctors)
+    samples["index build"].append(time.perf_counter() - started)
+
+    for label, filters in QUERIES:
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            total, page = directory.search(filters, limit=args.limit)
+            samples[f"indexed {label}"].append(time.perf_counter() - started)
+        print(f"{label}: {total} matches")
+
+        if args.skip_linear:
+            continue
+        # The scan takes seconds at this size, so it runs once per query.
+        started = time.perf_counter()
+        expected = linear_search(doctors, filters, 0, args.limit)
+        samples[f"linear {label}"].append(time.perf_counter() - started)
+        if (total, page) != expected:
+            raise AssertionError(f"{label}: indexed result differs from linear scan")
+
+    summary = summarize(samples)
+    print_summary(f"{args.doctors} doctors, page size {args.limit}:", summary)
+    sys.exit(check_baseline("doctor_lookup", summary, args))
+
+
+if __name__ == "__main__":
+    main()
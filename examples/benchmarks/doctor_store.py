@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Startup, memory and lookup benchmark for the doctor directory stores.
+
+Writes a seeded synthetic ``doctors.json`` (500k doctors by default) to a
+temporary directory and converts it to the SQLite store once. It then opens
+the directory ``--runs`` times with each store in a fresh child process,
+which times the startup and the ``doctor_lookup.py`` query mix and reports
+its peak resident memory. Both stores must return the same pages.
+
+    uv run benchmarks/doctor_store.py --doctors 500000 --save-baseline
+    uv run benchmarks/doctor_store.py --doctors 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_utils import (  # noqa: E402
+    add_baseline_arguments,
+    check_baseline,
+    print_summary,
+    summarize,
+)
+from doctor_directory import build_sqlite, open_directory  # noqa: E402
+from doctor_lookup import QUERIES, synthetic_doctors  # noqa: E402
+
+STORES = ("memory", "sqlite")
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss survives fork+exec on Linux and would report the parent's
+    # peak, so prefer the per-process high-water mark from /proc.
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _child(store: str, json_path: Path, limit: int) -> None:
+    """Runs in a fresh interpreter: open, query, report timings as JSON."""
+    started = time.perf_counter()
+    directory = open_directory(json_path, store)
+    report: dict[str, object] = {"startup": time.perf_counter() - started}
+    pages = {}
+    for label, filters in QUERIES:
+        started = time.perf_counter()
+        total, page = directory.search(filters, limit=limit)
+        report[f"query {label}"] = time.perf_counter() - started
+        pages[label] = [total, [doc["id"] for doc in page]]
+    report["pages"] = pages
+    report["rss_mb"] = _peak_rss_mb()
+    print(json.dumps(report))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--doctors", type=int, default=500_000, help="Synthetic records")
+    parser.add_argument("--runs", type=int, default=3, help="Child processes per store")
+    parser.add_argument("--limit", type=int, default=20, help="Page size")
+    parser.add_argument("--child", nargs=2, metavar=("STORE", "JSON"), help=argparse.SUPPRESS)
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child[0], Path(args.child[1]), args.limit)
+        return
+
+    samples: dict[str, list[float]] = defaultdict(list)
+    peak_rss: dict[str, list[float]] = defaultdict(list)
+    pages: dict[str, object] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "doctors.json"
+        print(f"Writing {args.doctors} synthetic doctors to {json_path}...")
+        json_path.write_text(json.dumps(synthetic_doctors(args.doctors)), encoding="utf-8")
+
+        started = time.perf_counter()
+        build_sqlite(json_path, Path(tmp) / ".cache" / "doctors.sqlite3")
+        samples["sqlite convert"].append(time.perf_counter() - started)
+
+        for store in STORES:
+            for _ in range(args.runs):
+                output = subprocess.run(  # noqa: S603 - runs this script
+                    [
+                        sys.executable,
+                        __file__,
+                        "--child",
+                        store,
+                        str(json_path),
+                        "--limit",
+                        str(args.limit),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                report = json.loads(output.splitlines()[-1])
+                pages.setdefault(store, report.pop("pages"))
+                peak_rss[store].append(report.pop("rss_mb"))
+                for metric, seconds in report.items():
+                    samples[f"{store} {metric}"].append(seconds)
+            print(f"{store}: peak RSS {max(peak_rss[store]):.0f} MB")
+
+    if pages["memory"] != pages["sqlite"]:
+        raise AssertionError("memory and sqlite stores returned different pages")
+
+    summary = summarize(samples)
+    print_summary(f"{args.doctors} doctors, page size {args.limit}:", summary)
+    sys.exit(check_baseline("doctor_store", summary, args))
+
+
+if __name__ == "__main__":
+    main()
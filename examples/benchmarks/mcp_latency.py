@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Tool-call latency benchmark: stdio doctor MCP server vs the pooled HTTP one.
+
+The provider agent's MCP adapter opens a new session for every tool call.
+Over stdio, that means starting a new ``mcpserver.py`` process (by default
+through ``uv run``) and loading the doctor data each time. The benchmark
+makes ``--calls`` sequential ``list_doctors`` calls that way, one fresh
+session each, against both transports. It then fires ``--concurrency``
+calls at once, as several provider agents would. The HTTP server is started
+once up front with ``--workers`` processes, and its startup is reported
+separately.
+
+    uv run benchmarks/mcp_latency.py --calls 10 --save-baseline
+    uv run benchmarks/mcp_latency.py --calls 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+EXAMPLES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(EXAMPLES_DIR))
+
+from bench_utils import (  # noqa: E402
+    add_baseline_arguments,
+    check_baseline,
+    print_summary,
+    summarize,
+)
+
+TOOL_ARGUMENTS = {"state": "tx", "limit": 5}
+SERVER_START_TIMEOUT_S = 60.0
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+async def _call(session: ClientSession) -> Any:
+    await session.initialize()
+    result = await session.call_tool("list_doctors", TOOL_ARGUMENTS)
+    if result.isError:
+        raise RuntimeError(f"list_doctors failed: {result.content}")
+    return json.loads(result.content[0].text)
+
+
+async def stdio_call(command: list[str]) -> Any:
+    """One tool call over a fresh stdio session, like the MCP adapter makes."""
+    params = StdioServerParameters(
+        command=command[0], args=command[1:], env=dict(os.environ), cwd=EXAMPLES_DIR
+    )
+    async with (
+        stdio_client(params) as (read, write),
+        ClientSession(read, write) as session,
+    ):
+        return await _call(session)
+
+
+async def http_call(url: str) -> Any:
+    """One tool call over a fresh streamable HTTP session."""
+    async with (
+        streamablehttp_client(url) as (read, write, _),
+        ClientSession(read, write) as session,
+    ):
+        return await _call(session)
+
+
+async def _wait_for_server(url: str, server: subprocess.Popen[bytes]) -> None:
+    deadline = time.perf_counter() + SERVER_START_TIMEOUT_S
+    while True:
+        if server.poll() is not None:
+            raise RuntimeError(f"HTTP server exited with status {server.returncode}")
+        try:
+            await http_call(url)
+        except Exception:  # noqa: BLE001 - not listening yet
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+        else:
+            return
+
+
+async def _measure(
+    name: str,
+    call: Callable[[], Awaitable[Any]],
+    args: argparse.Namespace,
+    samples: dict[str, list[float]],
+) -> Any:
+    result = None
+    for _ in range(args.calls):
+        started = time.perf_counter()
+        result = await call()
+        samples[f"{name} call"].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(call() for _ in range(args.concurrency)))
+    wall = time.perf_counter() - started
+    samples[f"{name} burst x{args.concurrency}"].append(wall)
+    if any(other != result for other in results):
+        raise AssertionError(f"{name}: concurrent calls returned different results")
+    median_ms = statistics.median(samples[f"{name} call"]) * 1000
+    print(
+        f"{name}: median call {median_ms:.0f}ms, "
+        f"{args.concurrency} concurrent calls in {wall:.2f}s"
+    )
+    return result
+
+
+async def _run(args: argparse.Namespace) -> dict[str, list[float]]:
+    samples: dict[str, list[float]] = defaultdict(list)
+    stdio_command = shlex.split(args.stdio_command)
+    stdio_result = await _measure(
+        "stdio", lambda: stdio_call(stdio_command), args, samples
+    )
+
+    host = "127.0.0.1"
+    port = _free_port(host)
+    url = f"http://{host}:{port}/mcp"
+    started = time.perf_counter()
+    server = subprocess.Popen(  # noqa: S603 - starts the example server
+        [
+            sys.executable,
+            "mcpserver.py",
+            "--transport",
+            "streamable-http",
+            "--host",
+            host,
+            "--port",
+            str(port),
+            "--workers",
+            str(args.workers),
+        ],
+        cwd=EXAMPLES_DIR,
+        # FastMCP logs every request at INFO; a crash still shows up in poll().
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        await _wait_for_server(url, server)
+        samples["http server start"].append(time.perf_counter() - started)
+        http_result = await _measure("http", lambda: http_call(url), args, samples)
+    finally:
+        server.terminate()
+        server.wait()
+
+    if http_result != stdio_result:
+        raise AssertionError("stdio and HTTP servers returned different results")
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=10, help="Sequential calls per transport")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Simultaneous calls in the burst"
+    )
+    parser.add_argument("--workers", type=int, default=4, help="HTTP server worker processes")
+    parser.add_argument(
+        "--stdio-command",
+        default="uv run mcpserver.py",
+        help="How the provider agent starts the stdio server",
+    )
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    summary = summarize(asyncio.run(_run(args)))
+    print_summary(
+        f"{args.calls} calls per transport, burst of {args.concurrency}, "
+        f"{args.workers} HTTP workers:",
+        summary,
+    )
+    sys.exit(check_baseline("mcp_latency", summary, args))
+
+
+if __name__ == "__main__":
+    main()
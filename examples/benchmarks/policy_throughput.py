@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for PolicyAgent with a mocked completion backend.
+
+``litellm.completion`` and ``litellm.acompletion`` are replaced by fakes that
+wait ``--latency`` seconds, so no model is called. The benchmark fires
+``--requests`` concurrent queries from one event loop in two ways and reports
+wall time and the worst event-loop stall seen by a heartbeat task:
+
+* ``blocking``: the old path, where an async handler calls ``answer_query``.
+* ``async``: ``aanswer_query`` with up to ``--max-concurrency`` completions.
+
+    uv run benchmarks/policy_throughput.py --requests 32 --save-baseline
+    uv run benchmarks/policy_throughput.py --requests 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import litellm
+
+EXAMPLES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(EXAMPLES_DIR))
+
+from bench_utils import (  # noqa: E402
+    add_baseline_arguments,
+    check_baseline,
+    print_summary,
+    summarize,
+)
+from policy_agent import PolicyAgent  # noqa: E402
+
+HEARTBEAT_S = 0.01
+
+
+def _fake_response() -> SimpleNamespace:
+    message = SimpleNamespace(content="Covered at $30 copay.")
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _mock_backend(latency_s: float) -> None:
+    def completion(**_: Any) -> SimpleNamespace:
+        time.sleep(latency_s)
+        return _fake_response()
+
+    async def acompletion(**_: Any) -> SimpleNamespace:
+        await asyncio.sleep(latency_s)
+        return _fake_response()
+
+    litellm.completion = completion
+    litellm.acompletion = acompletion
+
+
+async def _measure(
+    requests: int, query: Callable[[str], Awaitable[str]]
+) -> tuple[float, float]:
+    """Runs ``requests`` queries concurrently; returns (wall, worst loop stall)."""
+    worst_stall = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat() -> None:
+        nonlocal worst_stall
+        while not done.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(HEARTBEAT_S)
+            worst_stall = max(worst_stall, time.perf_counter() - before - HEARTBEAT_S)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(query(f"question {i}") for i in range(requests)))
+    wall = time.perf_counter() - started
+    done.set()
+    await beat
+    return wall, worst_stall
+
+
+async def _run(args: argparse.Namespace) -> dict[str, list[float]]:
+    agent = PolicyAgent(max_concurrency=args.max_concurrency)
+
+    async def blocking(prompt: str) -> str:
+        return agent.answer_query(prompt)
+
+    samples: dict[str, list[float]] = {}
+    for name, query in (("blocking", blocking), ("async", agent.aanswer_query)):
+        for _ in range(args.runs):
+            wall, stall = await _measure(args.requests, query)
+            samples.setdefault(f"{name} wall", []).append(wall)
+            samples.setdefault(f"{name} loop stall", []).append(stall)
+            print(
+                f"{name}: {args.requests} requests in {wall:.2f}s "
+                f"({args.requests / wall:.1f}/s), worst loop stall {stall * 1000:.0f}ms"
+            )
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=32, help="Concurrent queries")
+    parser.add_argument(
+        "--latency", type=float, default=0.1, help="Mocked completion latency in seconds"
+    )
+    parser.add_argument(
+        "--max-concurrency", type=int, default=8, help="PolicyAgent completion limit"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Runs per mode")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    # PolicyAgent opens its data files relative to the examples directory.
+    os.chdir(EXAMPLES_DIR)
+    _mock_backend(args.latency)
+    summary = summarize(asyncio.run(_run(args)))
+    print_summary(
+        f"{args.requests} requests, mocked latency {args.latency:.2f}s, "
+        f"max concurrency {args.max_concurrency}:",
+        summary,
+    )
+    sys.exit(check_baseline("policy_throughput", summary, args))
+
+
+if __name__ == "__main__":
+    main()
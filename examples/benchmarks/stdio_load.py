@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Load test for the pipelined DemoStack stdio loop.
+
+Serves a stub healthcare agent over A2A that echoes each prompt after a fixed
+delay, then pushes a burst of prompts through ``DemoStack.run_pipelined`` at
+each ``--max-inflight`` level. It reports wall time and per-request latency,
+and it checks that every request got its own answer back exactly once.
+
+    uv run benchmarks/stdio_load.py --prompts 40 --max-inflight 1 8 --save-baseline
+    uv run benchmarks/stdio_load.py --prompts 40 --max-inflight 1 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import uvicorn
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.events import EventQueue
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import AgentCapabilities, AgentCard
+from a2a.utils import new_agent_text_message
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from a2a_adk_mcp_agent import DemoStack  # noqa: E402
+from bench_utils import (  # noqa: E402
+    add_baseline_arguments,
+    check_baseline,
+    print_summary,
+    summarize,
+)
+
+
+class EchoExecutor(AgentExecutor):
+    """Stands in for the healthcare agent: echoes the prompt after a delay."""
+
+    def __init__(self, latency_s: float) -> None:
+        self.latency_s = latency_s
+
+    async def execute(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+    ) -> None:
+        await asyncio.sleep(self.latency_s)
+        message = new_agent_text_message(f"echo: {context.get_user_input()}")
+        await event_queue.enqueue_event(message)
+
+    async def cancel(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+    ) -> None:
+        pass
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+async def _serve_stub(
+    host: str, port: int, latency_s: float
+) -> tuple[uvicorn.Server, asyncio.Task[None]]:
+    agent_card = AgentCard(
+        name="StubHealthcareAgent",
+        description="Echoes prompts after a fixed delay.",
+        url=f"http://{host}:{port}/",
+        version="1.0.0",
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        capabilities=AgentCapabilities(streaming=False),
+        skills=[],
+    )
+    request_handler = DefaultRequestHandler(
+        agent_executor=EchoExecutor(latency_s),
+        task_store=InMemoryTaskStore(),
+    )
+    app = A2AStarletteApplication(agent_card=agent_card, http_handler=request_handler)
+    server = uvicorn.Server(
+        uvicorn.Config(app.build(), host=host, port=port, log_level="warning")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, serving
+
+
+async def _run_level(
+    stack: DemoStack, count: int, max_inflight: int
+) -> tuple[float, list[float]]:
+    sent_at: dict[int, float] = {}
+    latencies: list[float] = []
+    answers: dict[int, str] = {}
+
+    async def prompts() -> AsyncIterator[str]:
+        for request_id in range(1, count + 1):
+            sent_at[request_id] = time.perf_counter()
+            yield f"prompt {request_id}"
+
+    def emit(line: str) -> None:
+        tag, _, text = line.partition(" ")
+        request_id = int(tag.strip("[#]"))
+        if request_id in answers:
+            raise AssertionError(f"request #{request_id} answered twice")
+        answers[request_id] = text
+        latencies.append(time.perf_counter() - sent_at[request_id])
+
+    started = time.perf_counter()
+    await stack.run_pipelined(prompts(), max_inflight, emit)
+    wall = time.perf_counter() - started
+
+    for request_id in range(1, count + 1):
+        expected = f"echo: prompt {request_id}"
+        if answers.get(request_id) != expected:
+            raise AssertionError(
+                f"request #{request_id}: expected {expected!r}, got {answers.get(request_id)!r}"
+            )
+    return wall, latencies
+
+
+async def _run(args: argparse.Namespace) -> dict[str, list[float]]:
+    host = "127.0.0.1"
+    port = _free_port(host)
+    os.environ["AGENT_HOST"] = host
+    os.environ["HEALTHCARE_AGENT_PORT"] = str(port)
+    server, serving = await _serve_stub(host, port, args.latency)
+    stack = DemoStack()
+
+    samples: dict[str, list[float]] = {}
+    try:
+        for max_inflight in args.max_inflight:
+            for _ in range(args.runs):
+                wall, latencies = await _run_level(stack, args.prompts, max_inflight)
+                samples.setdefault(f"inflight={max_inflight} wall", []).append(wall)
+                samples.setdefault(f"inflight={max_inflight} latency", []).extend(
+                    latencies
+                )
+                print(
+                    f"inflight={max_inflight}: {args.prompts} prompts in {wall:.2f}s "
+                    f"({args.prompts / wall:.1f}/s)"
+                )
+    finally:
+        server.should_exit = True
+        await serving
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--prompts", type=int, default=40, help="Prompts per run")
+    parser.add_argument(
+        "--max-inflight",
+        type=int,
+        nargs="+",
+        default=[1, 8],
+        help="In-flight limits to measure (default: 1 8)",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.2, help="Stub agent reply delay in seconds"
+    )
+    parser.add_argument("--runs", type=int, default=1, help="Runs per in-flight limit")
+    add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    summary = summarize(asyncio.run(_run(args)))
+    print_summary(
+        f"{args.prompts} prompts per run, stub latency {args.latency:.2f}s:", summary
+    )
+    sys.exit(check_baseline("stdio_load", summary, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""Indexed, case-insensitive doctor lookup for the provider MCP server.
+
+``DoctorDirectory`` builds one hash index per searchable field when the data
+is loaded. Each index maps a case-folded value to the set of matching row
+numbers, so a search intersects a few sets, starting with the smallest one.
+It never scans every record. Results keep the order of the source file and
+are returned a page at a time.
+
+For large directories, ``SqliteDoctorDirectory`` offers the same search with
+compact storage. ``doctors.json`` is streamed once into an SQLite file under
+``data/.cache``, holding one compact JSON row per doctor and, for each
+(field, value) term, the matching row numbers as a packed integer array.
+Opening the file is near-instant. A search loads only the arrays for its
+filters, so memory does not grow with the whole dataset, and only the
+records on the returned page are decoded. The file is rebuilt when the JSON
+file's size or modification time changes.
+
+Convert ahead of time, or try a search, from the command line:
+
+    python doctor_directory.py data/doctors.json
+    python doctor_directory.py data/doctors.json --state ma --specialty psychiatry
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import os
+import sqlite3
+import sys
+import threading
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any, Protocol
+
+STORE_VERSION = 1
+POSTING_TYPECODE = "I"
+JSON_READ_CHUNK = 1 << 20
+INSERT_BATCH = 10_000
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Searchable field -> values of that field for one doctor record.
+INDEXED_FIELDS: dict[str, Callable[[dict[str, Any]], Iterable[Any]]] = {
+    "state": lambda doc: [doc["address"]["state"]],
+    "city": lambda doc: [doc["address"]["city"]],
+    "zip_code": lambda doc: [doc["address"]["zip_code"]],
+    "specialty": lambda doc: [doc["specialty"]],
+    "language": lambda doc: doc.get("languages", []),
+    "insurance": lambda doc: doc.get("insurance_accepted", []),
+    "accepts_new_patients": lambda doc: [doc.get("accepts_new_patients")],
+}
+
+
+def index_key(value: Any) -> Any:
+    """Case-folds and trims strings; other values (booleans) are used as is."""
+    return value.strip().casefold() if isinstance(value, str) else value
+
+
+def _term(value: Any) -> str:
+    """``index_key`` as stored in SQLite, where booleans become JSON text."""
+    key = index_key(value)
+    return key if isinstance(key, str) else json.dumps(key)
+
+
+class Directory(Protocol):
+    """What ``mcpserver.list_doctors`` needs from a doctor store."""
+
+    def search(
+        self,
+        filters: dict[str, Any],
+        offset: int = ...,
+        limit: int = ...,
+    ) -> tuple[int, list[dict[str, Any]]]: ...
+
+
+class DoctorDirectory:
+    """In-memory doctor records with an inverted index per searchable field."""
+
+    def __init__(self, doctors: list[dict[str, Any]]) -> None:
+        self.doctors = doctors
+        self.indexes: dict[str, dict[Any, set[int]]] = {
+            field: {} for field in INDEXED_FIELDS
+        }
+        for row, doc in enumerate(doctors):
+            for field, values_of in INDEXED_FIELDS.items():
+                index = self.indexes[field]
+                for value in values_of(doc):
+                    if value is not None:
+                        index.setdefault(index_key(value), set()).add(row)
+
+    @classmethod
+    def from_json(cls, path: Path) -> DoctorDirectory:
+        """Loads and indexes a JSON list of doctor records."""
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def search(
+        self,
+        filters: dict[str, Any],
+        offset: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """Finds doctors matching every filter.
+
+        Args:
+            filters: Field name from ``INDEXED_FIELDS`` -> wanted value. ``None``
+                values are ignored.
+            offset: Matches to skip, in source order.
+            limit: Maximum records to return.
+
+        Returns:
+            The total number of matches and the requested page of records.
+
+        Raises:
+            KeyError: If a filter names a field that is not indexed.
+        """
+        postings = []
+        for field, value in filters.items():
+            if value is None:
+                continue
+            postings.append(self.indexes[field].get(index_key(value), set()))
+        if not postings:
+            return len(self.doctors), self.doctors[offset : offset + limit]
+
+        postings.sort(key=len)
+        matches = (
+            postings[0].intersection(*postings[1:]) if len(postings) > 1 else postings[0]
+        )
+        page = heapq.nsmallest(offset + limit, matches)[offset:]
+        return len(matches), [self.doctors[row] for row in page]
+
+
+def iter_json_array(path: Path) -> Iterator[dict[str, Any]]:
+    """Yields the objects of a top-level JSON array without loading it whole.
+
+    Raises:
+        ValueError: If the file is not a JSON array of objects.
+    """
+    decoder = json.JSONDecoder()
+    with path.open(encoding="utf-8") as file:
+        buffer = file.read(JSON_READ_CHUNK).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"{path} does not contain a JSON array")
+        position = 1
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) and buffer[position] == "]":
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The next object straddles the chunk boundary: read more.
+                more = file.read(JSON_READ_CHUNK)
+                if not more:
+                    raise
+                buffer = buffer[position:] + more
+                position = 0
+                continue
+            if not isinstance(item, dict):
+                raise ValueError(f"{path} must hold an array of objects")
+            yield item
+
+
+def _source_stamp(json_path: Path) -> str:
+    stat = json_path.stat()
+    # Posting arrays are stored in native layout, so the platform is part of it.
+    layout = f"{sys.byteorder}{array(POSTING_TYPECODE).itemsize}"
+    return f"{STORE_VERSION}:{layout}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def build_sqlite(json_path: Path, db_path: Path) -> int:
+    """Streams ``json_path`` into a fresh SQLite store; returns the row count."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    db = sqlite3.connect(tmp_path)
+    try:
+        db.executescript(
+            """
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE doctors (row INTEGER PRIMARY KEY, record TEXT NOT NULL);
+            CREATE TABLE postings (
+                field TEXT NOT NULL, value TEXT NOT NULL, rows BLOB NOT NULL,
+                PRIMARY KEY (field, value)
+            ) WITHOUT ROWID;
+            """
+        )
+        # Row numbers only grow, so each posting array is built already sorted.
+        postings: dict[tuple[str, str], array[int]] = {}
+        records: list[tuple[int, str]] = []
+        count = 0
+        for row, doc in enumerate(iter_json_array(json_path)):
+            records.append((row, json.dumps(doc, separators=(",", ":"))))
+            for field, values_of in INDEXED_FIELDS.items():
+                for term in {_term(value) for value in values_of(doc) if value is not None}:
+                    postings.setdefault((field, term), array(POSTING_TYPECODE)).append(row)
+            count = row + 1
+            if len(records) >= INSERT_BATCH:
+                db.executemany("INSERT INTO doctors VALUES (?, ?)", records)
+                records.clear()
+        db.executemany("INSERT INTO doctors VALUES (?, ?)", records)
+        db.executemany(
+            "INSERT INTO postings VALUES (?, ?, ?)",
+            ((field, term, rows.tobytes()) for (field, term), rows in postings.items()),
+        )
+        db.execute(
+            "INSERT INTO meta VALUES ('source', ?)", (_source_stamp(json_path),)
+        )
+        db.commit()
+    finally:
+        db.close()
+    tmp_path.replace(db_path)
+    return count
+
+
+class SqliteDoctorDirectory:
+    """Doctor records served from an SQLite file, decoded one page at a time."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._uri = f"{db_path.resolve().as_uri()}?mode=ro"
+        # One read-only connection per thread, so worker threads can share it.
+        self._local = threading.local()
+
+    @classmethod
+    def for_json(
+        cls, json_path: Path, cache_dir: Path | None = None
+    ) -> SqliteDoctorDirectory:
+        """Opens the store for ``json_path``, converting it first when stale.
+
+        Args:
+            json_path: The source ``doctors.json``.
+            cache_dir: Where the store lives; defaults to ``.cache`` next to
+                the JSON file.
+        """
+        cache_dir = cache_dir or json_path.parent / ".cache"
+        db_path = cache_dir / f"{json_path.stem}.sqlite3"
+        try:
+            with sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True) as db:
+                (stamp,) = db.execute(
+                    "SELECT value FROM meta WHERE key = 'source'"
+                ).fetchone()
+        except (sqlite3.Error, TypeError):
+            stamp = None
+        if stamp != _source_stamp(json_path):
+            build_sqlite(json_path, db_path)
+        return cls(db_path)
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self._uri, uri=True)
+            self._local.db = db
+        return db
+
+    def _posting(self, field: str, value: Any) -> array[int]:
+        if field not in INDEXED_FIELDS:
+            raise KeyError(field)
+        found = self._db.execute(
+            "SELECT rows FROM postings WHERE field = ? AND value = ?",
+            (field, _term(value)),
+        ).fetchone()
+        rows = array(POSTING_TYPECODE)
+        if found is not None:
+            rows.frombytes(found[0])
+        return rows
+
+    def search(
+        self,
+        filters: dict[str, Any],
+        offset: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """Same contract as ``DoctorDirectory.search``."""
+        postings = [
+            self._posting(field, value)
+            for field, value in filters.items()
+            if value is not None
+        ]
+        if not postings:
+            (total,) = self._db.execute("SELECT count(*) FROM doctors").fetchone()
+            page = list(range(offset, min(offset + limit, total)))
+        elif len(postings) == 1:
+            total, page = len(postings[0]), postings[0][offset : offset + limit].tolist()
+        else:
+            postings.sort(key=len)
+            matches = set(postings[0])
+            for rows in postings[1:]:
+                matches.intersection_update(rows)
+            total = len(matches)
+            page = heapq.nsmallest(offset + limit, matches)[offset:]
+        if not page:
+            return total, []
+
+        placeholders = ", ".join("?" * len(page))
+        records = dict(
+            self._db.execute(
+                f"SELECT row, record FROM doctors WHERE row IN ({placeholders})",  # noqa: S608 - placeholders only
+                page,
+            )
+        )
+        return total, [json.loads(records[row]) for row in page]
+
+
+def open_directory(json_path: Path, store: str = "memory") -> Directory:
+    """Opens ``json_path`` with the ``memory`` or ``sqlite`` store.
+
+    Raises:
+        ValueError: If ``store`` is not a known store name.
+    """
+    if store == "memory":
+        return DoctorDirectory.from_json(json_path)
+    if store == "sqlite":
+        return SqliteDoctorDirectory.for_json(json_path)
+    raise ValueError(f"Unknown doctor store {store!r}; use 'memory' or 'sqlite'")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert or search a doctor directory")
+    parser.add_argument("json", type=Path, help="doctors.json to convert")
+    for field in INDEXED_FIELDS:
+        parser.add_argument(f"--{field.replace('_', '-')}", dest=field)
+    parser.add_argument("--limit", type=int, default=5, help="Doctors to print")
+    args = parser.parse_args()
+
+    directory = SqliteDoctorDirectory.for_json(args.json)
+    print(f"{args.json} -> {directory.db_path}")
+    filters = {field: getattr(args, field) for field in INDEXED_FIELDS}
+    if args.accepts_new_patients is not None:
+        filters["accepts_new_patients"] = args.accepts_new_patients.lower() == "true"
+    total, doctors = directory.search(filters, limit=args.limit)
+    print(f"{total} matching doctors")
+    for doc in doctors:
+        print(f"  {doc['id']}  {doc['name']}  {doc['specialty']}  {doc['address']['city']}, {doc['address']['state']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Shared HTTP transport for the concierge's A2A handoffs.
+
+By default every ``A2AAgent.run`` opens and closes its own ``httpx`` client.
+That means no connection reuse, no limit on how many calls hit one agent at
+once, and no read timeout. ``HandoffTransport`` is a single transport shared
+by all handoff agents:
+
+* Keep-alive pooling: one connection pool serves every run, and idle
+  connections are kept for ``KEEPALIVE_EXPIRY_S``.
+* HTTP/2 is negotiated for ``https`` agents when the ``h2`` package is
+  installed. Plain ``http`` agents use HTTP/1.1 keep-alive.
+* At most ``max_inflight_per_target`` requests run per agent (scheme, host,
+  port). Further requests wait, up to the pool timeout, for a free slot.
+* Each agent has a circuit breaker. After ``failure_threshold`` consecutive
+  failures (connection errors, timeouts, 5xx responses), calls to that agent
+  fail immediately with ``CircuitOpenError`` for ``cooldown_s``. After that,
+  a single trial call decides whether the breaker closes again.
+
+The A2A client reports transport errors as a failed handoff, so a dead agent
+costs the concierge one fast tool error instead of a stalled answer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+
+import httpx
+from beeai_framework.adapters.a2a.agents import A2AAgent
+from beeai_framework.adapters.a2a.agents.agent import (
+    A2AAgentParameters,
+    HttpxAsyncClientParameters,
+)
+
+CONNECT_TIMEOUT_S = 5.0
+KEEPALIVE_EXPIRY_S = 60.0
+MAX_KEEPALIVE_CONNECTIONS = 20
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without a network call while a target's breaker is open."""
+
+
+@dataclass
+class _TargetState:
+    slots: asyncio.Semaphore
+    failures: int = 0
+    opened_at: float | None = None
+    probing: bool = False
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that reports the outcome once it is read or closed."""
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        ok: bool,
+        on_done: Callable[[bool | None], None],
+    ) -> None:
+        self._stream = stream
+        self._ok = ok
+        self._on_done: Callable[[bool | None], None] | None = on_done
+
+    def _finish(self, ok: bool | None) -> None:
+        if self._on_done is not None:
+            on_done, self._on_done = self._on_done, None
+            on_done(ok)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except httpx.TransportError:
+            self._finish(False)
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._finish(self._ok)
+
+
+class HandoffTransport(httpx.AsyncBaseTransport):
+    """Pooled transport with per-target concurrency limits and breakers."""
+
+    def __init__(
+        self,
+        max_inflight_per_target: int = 4,
+        failure_threshold: int = 3,
+        cooldown_s: float = 30.0,
+        timeout_s: float = 120.0,
+        http2: bool | None = None,
+    ) -> None:
+        self.max_inflight_per_target = max_inflight_per_target
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.timeout = httpx.Timeout(timeout_s, connect=CONNECT_TIMEOUT_S)
+        if http2 is None:
+            http2 = importlib.util.find_spec("h2") is not None
+        self._inner = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_S,
+            ),
+        )
+        self._targets: dict[tuple[str, str, int | None], _TargetState] = {}
+
+    @classmethod
+    def from_env(cls) -> HandoffTransport:
+        """Builds the transport from the ``HANDOFF_*`` settings."""
+        return cls(
+            max_inflight_per_target=int(os.getenv("HANDOFF_MAX_INFLIGHT_PER_AGENT", "4")),
+            failure_threshold=int(os.getenv("HANDOFF_BREAKER_FAILURES", "3")),
+            cooldown_s=float(os.getenv("HANDOFF_BREAKER_COOLDOWN_S", "30")),
+            timeout_s=float(os.getenv("HANDOFF_TIMEOUT_S", "120")),
+        )
+
+    def agent_parameters(self) -> A2AAgentParameters:
+        """``A2AAgent`` parameters that route its runs through this transport."""
+        return A2AAgentParameters(
+            httpx_async_client=HttpxAsyncClientParameters(
+                transport=self, timeout=self.timeout
+            )
+        )
+
+    def _target(self, request: httpx.Request) -> _TargetState:
+        key = (request.url.scheme, request.url.host, request.url.port)
+        target = self._targets.get(key)
+        if target is None:
+            target = _TargetState(asyncio.Semaphore(self.max_inflight_per_target))
+            self._targets[key] = target
+        return target
+
+    def _admit(self, target: _TargetState, request: httpx.Request) -> None:
+        if target.opened_at is None:
+            return
+        remaining_s = target.opened_at + self.cooldown_s - time.monotonic()
+        if remaining_s > 0 or target.probing:
+            raise CircuitOpenError(
+                f"Circuit open for {request.url.host}:{request.url.port} after "
+                f"{target.failures} consecutive failures",
+                request=request,
+            )
+        # Half-open: let this one request through as a trial.
+        target.probing = True
+
+    def _record(self, target: _TargetState, ok: bool | None) -> None:
+        if ok is None:  # Cancelled; says nothing about the target's health.
+            target.probing = False
+            return
+        if ok:
+            target.failures = 0
+            target.opened_at = None
+        else:
+            target.failures += 1
+            if target.probing or target.failures >= self.failure_threshold:
+                target.opened_at = time.monotonic()
+        target.probing = False
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        target = self._target(request)
+        self._admit(target, request)
+        pool_timeout = request.extensions.get("timeout", {}).get("pool")
+        try:
+            async with asyncio.timeout(pool_timeout):
+                await target.slots.acquire()
+        except TimeoutError as exc:
+            self._record(target, None)
+            raise httpx.PoolTimeout(
+                f"No free handoff slot for {request.url.host}:{request.url.port}",
+                request=request,
+            ) from exc
+        except BaseException:
+            self._record(target, None)
+            raise
+
+        def done(ok: bool | None) -> None:
+            target.slots.release()
+            self._record(target, ok)
+
+        try:
+            response = await self._inner.handle_async_request(request)
+        except httpx.TransportError:
+            done(False)
+            raise
+        except BaseException:
+            done(None)
+            raise
+        # The slot stays taken until the body (possibly an SSE stream) is done.
+        response.stream = _ReleasingStream(
+            response.stream, response.status_code < 500, done
+        )
+        return response
+
+    async def aclose(self) -> None:
+        # Each A2AAgent run closes its own client, and with it this transport;
+        # the shared pool must outlive those runs. Use close() at shutdown.
+        pass
+
+    async def close(self) -> None:
+        await self._inner.aclose()
+
+
+class PooledA2AAgent(A2AAgent):
+    """``A2AAgent`` whose clones keep its parameters.
+
+    ``HandoffTool`` runs a fresh clone of its target for every call, and
+    ``A2AAgent.clone`` drops the HTTP parameters that point at the shared
+    transport.
+    """
+
+    async def clone(self) -> PooledA2AAgent:
+        cloned = PooledA2AAgent(
+            agent_card=self.agent_card,
+            memory=await self.memory.clone(),
+            parameters=self._parameters,
+        )
+        cloned.emitter = await self.emitter.clone()
+        return cloned
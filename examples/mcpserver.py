@@ -1,44 +1,153 @@
-import json
+"""Doctor directory MCP server.
+
+By default it serves one client over stdio, as started by
+``a2a_provider_agent.py``. With ``--transport streamable-http`` it runs as a
+long-lived local HTTP server instead. That server has a pool of ``--workers``
+processes that load the directory at startup, and several provider agents
+can share it by setting ``DOCTOR_MCP_URL``:
+
+    uv run mcpserver.py --transport streamable-http --port 9995 --workers 4
+"""
+
+import argparse
+import functools
+import os
 from pathlib import Path
 
+import uvicorn
+from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
+from starlette.applications import Starlette
+
+from doctor_directory import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Directory, open_directory
+
+# MCP stdio clients start this server with a minimal environment.
+load_dotenv()
+
+# Initialize the server. Over HTTP every request stands alone, so any worker
+# in the pool can answer it.
+mcp = FastMCP("doctorserver", stateless_http=True, json_response=True)
 
-# Initialize the server
-mcp = FastMCP("doctorserver")
 
-# Load Data
-# Adjusted path to match project structure
-doctors: list = json.loads(Path("data/doctors.json").read_text())
+@functools.cache
+def get_directory() -> Directory:
+    """Loads the doctor data once per process."""
+    # Adjusted path to match project structure
+    # DOCTOR_STORE=sqlite serves large directories from a converted on-disk store.
+    return open_directory(
+        Path(os.getenv("DOCTORS_JSON", "data/doctors.json")),
+        store=os.getenv("DOCTOR_STORE", "memory"),
+    )
 
 
 @mcp.tool()
-def list_doctors(state: str | None = None, city: str | None = None) -> list[dict]:
-    """This tool returns a list of doctors practicing in a specific location. The search is case-insensitive.
+def list_doctors(
+    state: str | None = None,
+    city: str | None = None,
+    zip_code: str | None = None,
+    specialty: str | None = None,
+    language: str | None = None,
+    insurance: str | None = None,
+    accepts_new_patients: bool | None = None,
+    offset: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> dict:
+    """This tool returns doctors matching all of the given criteria. The search is case-insensitive.
 
     Args:
         state: The two-letter state code (e.g., "CA" for California).
         city: The name of the city or town (e.g., "Boston").
+        zip_code: The five-digit ZIP code (e.g., "02115").
+        specialty: The medical specialty (e.g., "Psychiatry").
+        language: A language the doctor speaks (e.g., "Spanish").
+        insurance: An insurance plan the doctor accepts (e.g., "Aetna").
+        accepts_new_patients: Only doctors that are (true) or are not (false)
+            accepting new patients.
+        offset: Number of matching doctors to skip, for paging through results.
+        limit: Maximum number of doctors to return (at most 100).
 
     Returns:
-        A JSON string representing a list of doctors matching the criteria.
+        An object with the total number of matches, the page of doctors and
+        the offset of the next page (null when there are no more results).
         If no criteria are provided, an error message is returned.
-        Example: '[{"name": "Dr John James", "specialty": "Cardiology", ...}]'
+        Example: '{"total": 1, "doctors": [{"name": "Dr John James", "specialty": "Cardiology", ...}], "next_offset": null}'
     """
+    filters = {
+        "state": state,
+        "city": city,
+        "zip_code": zip_code,
+        "specialty": specialty,
+        "language": language,
+        "insurance": insurance,
+        "accepts_new_patients": accepts_new_patients,
+    }
     # Input validation: ensure at least one search term is given.
-    if not state and not city:
-        return [{"error": "Please provide a state or a city."}]
+    if all(value is None or value == "" for value in filters.values()):
+        return {"error": "Please provide at least one search criterion."}
+    if offset < 0 or not 1 <= limit <= MAX_PAGE_SIZE:
+        return {"error": f"offset must be >= 0 and limit between 1 and {MAX_PAGE_SIZE}."}
+
+    total, doctors = get_directory().search(
+        {field: value for field, value in filters.items() if value != ""},
+        offset=offset,
+        limit=limit,
+    )
+    next_offset = offset + len(doctors)
+    return {
+        "total": total,
+        "offset": offset,
+        "doctors": doctors,
+        "next_offset": next_offset if next_offset < total else None,
+    }
+
+
+def http_app() -> Starlette:
+    """Builds the app for one HTTP worker, loading the directory up front."""
+    get_directory()
+    return mcp.streamable_http_app()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Doctor directory MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "streamable-http"],
+        default=os.getenv("DOCTOR_MCP_TRANSPORT", "stdio"),
+    )
+    parser.add_argument("--host", default=os.getenv("AGENT_HOST", "localhost"))
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("DOCTOR_MCP_PORT", "9995"))
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("DOCTOR_MCP_WORKERS", "4")),
+        help="Worker processes for the HTTP transport",
+    )
+    args = parser.parse_args()
 
-    target_state = state.strip().lower() if state else None
-    target_city = city.strip().lower() if city else None
+    if args.transport == "stdio":
+        get_directory()
+        mcp.run(transport="stdio")
+        return
 
-    return [
-        doc
-        for doc in doctors
-        if (not target_state or doc["address"]["state"].lower() == target_state)
-        and (not target_city or doc["address"]["city"].lower() == target_city)
-    ]
+    # Each worker imports this module and builds its own warm app; the
+    # workers share one listening socket.
+    print(
+        f"Doctor MCP server on http://{args.host}:{args.port}"
+        f"{mcp.settings.streamable_http_path} ({args.workers} workers)"
+    )
+    uvicorn.run(
+        "mcpserver:http_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        app_dir=str(Path(__file__).resolve().parent),
+        log_level="warning",
+    )
 
 
 # Kick off server if file is run
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    main()
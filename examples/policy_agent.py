@@ -1,42 +1,113 @@
+import asyncio
 import base64
+import os
 from pathlib import Path
+from typing import Any
 
 import litellm
 
 from helpers import setup_env
+from policy_index import PolicyIndex, format_excerpts
+
+MODEL = "gemini/gemini-3-flash-preview"
+# For Vertex AI
+# MODEL = "vertex_ai/gemini-3-flash-preview"
+
+POLICY_PDF = Path("data/2026AnthemgHIPSBC.pdf")
+
+SYSTEM_PROMPT = "You are an expert insurance agent designed to assist with coverage queries. Use the provided documents to answer questions about insurance policies. If the information is not available in the documents, respond with 'I don't know'"
 
 
 class PolicyAgent:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        request_timeout_s: float | None = None,
+        top_k: int | None = None,
+    ) -> None:
         setup_env()
-        with Path("data/2026AnthemgHIPSBC.pdf").open("rb") as file:
-            self.pdf_data = base64.standard_b64encode(file.read()).decode("utf-8")
-
-    def answer_query(self, prompt: str) -> str:
-        response = litellm.completion(
-            model="gemini/gemini-3-flash-preview",
-            # For Vertex AI
-            # model="vertex_ai/gemini-3-flash-preview",
-            reasoning_effort="minimal",
-            max_tokens=1000,
-            messages=[
+        self._pdf_data: str | None = None
+        # Chunks sent per query; 0 always sends the whole PDF.
+        self.top_k = int(os.getenv("POLICY_INDEX_TOP_K", "4")) if top_k is None else top_k
+        self.index: PolicyIndex | None = None
+        if self.top_k > 0:
+            self.index = PolicyIndex.for_pdf(POLICY_PDF)
+
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("POLICY_AGENT_MAX_CONCURRENCY", "8")
+        )
+        self.request_timeout_s = request_timeout_s or float(
+            os.getenv("POLICY_AGENT_TIMEOUT_S", "60")
+        )
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+    @property
+    def pdf_data(self) -> str:
+        # Only encoded when a query actually falls back to the full document.
+        if self._pdf_data is None:
+            with POLICY_PDF.open("rb") as file:
+                self._pdf_data = base64.standard_b64encode(file.read()).decode("utf-8")
+        return self._pdf_data
+
+    def _document_part(self, query: str) -> dict[str, Any]:
+        chunks = self.index.select(query, self.top_k) if self.index else None
+        if chunks is None:
+            return {
+                "type": "image_url",
+                "image_url": {"url": f"data:application/pdf;base64,{self.pdf_data}"},
+            }
+        return {
+            "type": "text",
+            "text": "Relevant excerpts from the policy document:\n\n"
+            + format_excerpts(chunks),
+        }
+
+    def _completion_kwargs(self, prompt: str, query: str | None = None) -> dict[str, Any]:
+        return {
+            "model": MODEL,
+            "reasoning_effort": "minimal",
+            "max_tokens": 1000,
+            "timeout": self.request_timeout_s,
+            "messages": [
                 {
                     "role": "system",
-                    "content": "You are an expert insurance agent designed to assist with coverage queries. Use the provided documents to answer questions about insurance policies. If the information is not available in the documents, respond with 'I don't know'",
+                    "content": SYSTEM_PROMPT,
                 },
                 {
                     "role": "user",
                     "content": [
                         {"type": "text", "text": prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:application/pdf;base64,{self.pdf_data}"
-                            },
-                        },
+                        self._document_part(query or prompt),
                     ],
                 },
             ],
-        )
+        }
 
+    @staticmethod
+    def _answer_text(response: Any) -> str:
         return response.choices[0].message.content.replace("$", r"\$")
+
+    def answer_query(self, prompt: str, query: str | None = None) -> str:
+        response = litellm.completion(**self._completion_kwargs(prompt, query))
+        return self._answer_text(response)
+
+    async def aanswer_query(self, prompt: str, query: str | None = None) -> str:
+        """Answers without blocking the event loop.
+
+        At most ``max_concurrency`` completions run at once; further calls
+        wait for a free slot. The time spent waiting for a slot counts against
+        ``request_timeout_s``, the same as the completion itself.
+
+        Args:
+            prompt: The full prompt sent to the model.
+            query: The user's question, used to pick policy excerpts; defaults
+                to ``prompt``.
+
+        Raises:
+            TimeoutError: If no answer arrives within ``request_timeout_s``.
+        """
+        async with asyncio.timeout(self.request_timeout_s), self._slots:
+            response = await litellm.acompletion(
+                **self._completion_kwargs(prompt, query)
+            )
+        return self._answer_text(response)
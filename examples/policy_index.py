@@ -0,0 +1,250 @@
+"""Cached text index of the policy PDF with BM25 chunk retrieval.
+
+The PDF text is extracted once (with ``pypdf``), split into overlapping
+line-based chunks per page and cached as JSON under ``data/.cache``. The
+cache is keyed by the PDF's SHA-256, so editing or replacing the PDF rebuilds
+it. At query time a small in-process BM25 ranker picks the chunks that match
+the question. ``PolicyIndex.select`` returns ``None`` when the match is weak,
+so callers can fall back to sending the whole document.
+
+Build or inspect the index from the command line:
+
+    python policy_index.py data/2026AnthemgHIPSBC.pdf
+    python policy_index.py data/2026AnthemgHIPSBC.pdf --query "specialist visit"
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from pypdf import PdfReader
+
+INDEX_VERSION = 1
+CHUNK_WORDS = 120
+CHUNK_OVERLAP_WORDS = 30
+
+# BM25 parameters and the confidence gate for select().
+BM25_K1 = 1.5
+BM25_B = 0.75
+MIN_TOP_SCORE = 1.0
+MIN_TERM_COVERAGE = 0.5
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:['-][a-z0-9]+)*")
+STOPWORDS = frozenset(
+    """
+    a about above after again all am an and any are as at be because been before
+    being below between both but by can could did do does doing down during each
+    few for from further had has have having he her here hers him his how i if in
+    into is it its itself just me more most my no nor not now of off on once only
+    or other our ours out over own same she should so some such than that the
+    their theirs them then there these they this those through to too under
+    until up very was we were what when where which while who whom why will with
+    would you your yours
+    """.split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cases, drops stop words and folds simple plurals."""
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("ies"):
+            token = token[:-3] + "y"
+        elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A run of consecutive lines from one page of the document."""
+
+    page: int
+    text: str
+
+
+def chunk_page(page: int, text: str) -> list[Chunk]:
+    """Splits one page into ~CHUNK_WORDS chunks that overlap by whole lines."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    chunks: list[Chunk] = []
+    start = 0
+    while start < len(lines):
+        end, words = start, 0
+        while end < len(lines) and (words < CHUNK_WORDS or end == start):
+            words += len(lines[end].split())
+            end += 1
+        chunks.append(Chunk(page, "\n".join(lines[start:end])))
+        if end >= len(lines):
+            break
+        # Step back over trailing lines worth ~CHUNK_OVERLAP_WORDS words.
+        overlap_start, overlap = end, 0
+        while overlap_start > start + 1 and overlap < CHUNK_OVERLAP_WORDS:
+            overlap_start -= 1
+            overlap += len(lines[overlap_start].split())
+        start = overlap_start
+    return chunks
+
+
+def extract_pages(pdf_path: Path) -> list[str]:
+    """Returns the text of each PDF page."""
+    return [page.extract_text() or "" for page in PdfReader(pdf_path).pages]
+
+
+class PolicyIndex:
+    """BM25 index over the chunks of one document."""
+
+    def __init__(self, source: str, chunks: list[Chunk]) -> None:
+        self.source = source
+        self.chunks = chunks
+        self._chunk_terms = [Counter(tokenize(chunk.text)) for chunk in chunks]
+        self._lengths = [sum(terms.values()) for terms in self._chunk_terms]
+        self._avg_length = (sum(self._lengths) / len(chunks)) if chunks else 0.0
+        document_frequency: Counter[str] = Counter()
+        for terms in self._chunk_terms:
+            document_frequency.update(terms.keys())
+        total = len(chunks)
+        self._idf = {
+            term: math.log(1 + (total - count + 0.5) / (count + 0.5))
+            for term, count in document_frequency.items()
+        }
+
+    @classmethod
+    def for_pdf(cls, pdf_path: Path, cache_dir: Path | None = None) -> PolicyIndex:
+        """Loads the cached index for ``pdf_path``, building it when stale.
+
+        Args:
+            pdf_path: The source document.
+            cache_dir: Where index files live; defaults to ``.cache`` next to
+                the PDF.
+        """
+        cache_dir = cache_dir or pdf_path.parent / ".cache"
+        digest = hashlib.sha256(pdf_path.read_bytes()).hexdigest()
+        cache_path = cache_dir / f"{pdf_path.stem}.index.json"
+
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cached = None
+        if (
+            cached
+            and cached.get("version") == INDEX_VERSION
+            and cached.get("source_sha256") == digest
+            and cached.get("chunk_words") == [CHUNK_WORDS, CHUNK_OVERLAP_WORDS]
+        ):
+            return cls(pdf_path.name, [Chunk(**chunk) for chunk in cached["chunks"]])
+
+        chunks = [
+            chunk
+            for page, text in enumerate(extract_pages(pdf_path), start=1)
+            for chunk in chunk_page(page, text)
+        ]
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    "version": INDEX_VERSION,
+                    "source": pdf_path.name,
+                    "source_sha256": digest,
+                    "chunk_words": [CHUNK_WORDS, CHUNK_OVERLAP_WORDS],
+                    "chunks": [asdict(chunk) for chunk in chunks],
+                }
+            ),
+            encoding="utf-8",
+        )
+        tmp_path.replace(cache_path)
+        return cls(pdf_path.name, chunks)
+
+    def search(self, query: str, top_k: int) -> list[tuple[Chunk, float]]:
+        """Returns up to ``top_k`` chunks with a positive BM25 score, best first."""
+        query_terms = set(tokenize(query))
+        scored = []
+        for position, terms in enumerate(self._chunk_terms):
+            norm = BM25_K1 * (
+                1 - BM25_B + BM25_B * self._lengths[position] / (self._avg_length or 1)
+            )
+            score = sum(
+                self._idf[term] * terms[term] * (BM25_K1 + 1) / (terms[term] + norm)
+                for term in query_terms
+                if term in terms
+            )
+            if score > 0:
+                scored.append((score, position))
+        scored.sort(reverse=True)
+        return [(self.chunks[position], score) for score, position in scored[:top_k]]
+
+    def select(self, query: str, top_k: int) -> list[Chunk] | None:
+        """Picks the chunks to send for ``query``, in document order.
+
+        Returns:
+            The chunks, or ``None`` when the best score is below
+            ``MIN_TOP_SCORE`` or the chunks cover fewer than
+            ``MIN_TERM_COVERAGE`` of the query's indexed terms. In those cases
+            the caller should send the full document instead.
+        """
+        query_terms = {term for term in tokenize(query) if term in self._idf}
+        results = self.search(query, top_k)
+        if not query_terms or not results or results[0][1] < MIN_TOP_SCORE:
+            return None
+
+        chosen = [chunk for chunk, _ in results]
+        covered = set().union(*(tokenize(chunk.text) for chunk in chosen))
+        if len(query_terms & covered) / len(query_terms) < MIN_TERM_COVERAGE:
+            return None
+        order = {id(chunk): position for position, chunk in enumerate(self.chunks)}
+        return sorted(chosen, key=lambda chunk: order[id(chunk)])
+
+
+def format_excerpts(chunks: list[Chunk]) -> str:
+    """Renders chunks as page-labelled excerpts, dropping repeated overlap lines."""
+    sections: list[tuple[int, list[str]]] = []
+    for chunk in chunks:
+        lines = chunk.text.splitlines()
+        if sections and sections[-1][0] == chunk.page:
+            previous = sections[-1][1]
+            shared = next(
+                (
+                    size
+                    for size in range(min(len(previous), len(lines)), 0, -1)
+                    if previous[-size:] == lines[:size]
+                ),
+                0,
+            )
+            if shared:
+                previous.extend(lines[shared:])
+                continue
+        sections.append((chunk.page, lines))
+    return "\n\n".join(f"[page {page}]\n" + "\n".join(lines) for page, lines in sections)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or query the policy index")
+    parser.add_argument("pdf", type=Path, help="Policy PDF to index")
+    parser.add_argument("--query", help="Show the chunks selected for this question")
+    parser.add_argument("--top-k", type=int, default=4, help="Chunks per query")
+    args = parser.parse_args()
+
+    index = PolicyIndex.for_pdf(args.pdf)
+    words = sum(len(chunk.text.split()) for chunk in index.chunks)
+    print(f"{index.source}: {len(index.chunks)} chunks, {words} words")
+    if args.query:
+        selected = index.select(args.query, args.top_k)
+        if selected is None:
+            print("Low confidence: the full document would be sent.")
+            return
+        print(f"\n{format_excerpts(selected)}")
+
+
+if __name__ == "__main__":
+    main()
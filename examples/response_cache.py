@@ -0,0 +1,312 @@
+"""Response cache for the example A2A agents.
+
+Identical questions ("what is my deductible?") arrive from many users, and
+without a cache each one costs a full LLM call. ``CachedAgentExecutor`` wraps
+an agent's ``AgentExecutor`` and answers repeats from a ``ResponseCache``.
+The cache is an in-memory LRU, optionally backed by SQLite so entries survive
+restarts. Keys cover the normalized prompt, a hash of the agent's skill
+block, and the model name, so changing either invalidates old answers.
+
+Configuration (per agent name, e.g. ``POLICY`` or ``RESEARCH``):
+
+    RESPONSE_CACHE_TTL_<AGENT>   Seconds an answer stays valid; 0 disables.
+    RESPONSE_CACHE_MAX_ENTRIES   In-memory entries per agent (default: 512).
+    RESPONSE_CACHE_DB            Optional SQLite file shared by all agents.
+
+A request skips the cache when its A2A message or request metadata sets
+``"no_cache": true``, and when it continues a conversation (a ``context_id``
+seen before), since its answer may depend on the earlier turns. An agent
+marks a failure it answers with as text by setting ``"error": true`` in the
+message metadata, so the failure is not cached. Hit and miss counters are
+served as JSON on ``GET /cache/stats`` by each agent's server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import Event, EventQueue
+from a2a.types import (
+    Message,
+    Role,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatusUpdateEvent,
+)
+from a2a.utils import get_message_text, get_text_parts, new_agent_text_message
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+DEFAULT_MAX_ENTRIES = 512
+BYPASS_METADATA_KEY = "no_cache"
+ERROR_METADATA_KEY = "error"
+# Conversations remembered to tell follow-ups from first turns.
+MAX_TRACKED_CONTEXTS = 65_536
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case-folds, collapses whitespace and drops trailing punctuation."""
+    return _WHITESPACE_RE.sub(" ", prompt.casefold()).strip().rstrip("?!. ")
+
+
+class ResponseCache:
+    """LRU of answers with a TTL, optionally persisted to SQLite."""
+
+    def __init__(
+        self,
+        name: str,
+        ttl_s: float,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        db_path: str | None = None,
+    ) -> None:
+        self.name = name
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.metrics = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "follow_ups": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0,
+        }
+        self._db: sqlite3.Connection | None = None
+        if db_path and self.enabled:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "agent TEXT NOT NULL, key TEXT NOT NULL, answer TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (agent, key))"
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE agent = ? AND expires_at <= ?",
+                (name, time.time()),
+            )
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls, name: str, default_ttl_s: float) -> ResponseCache:
+        """Builds the cache for agent ``name`` from ``RESPONSE_CACHE_*`` settings."""
+        return cls(
+            name,
+            ttl_s=float(os.getenv(f"RESPONSE_CACHE_TTL_{name.upper()}", default_ttl_s)),
+            max_entries=int(
+                os.getenv("RESPONSE_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES))
+            ),
+            db_path=os.getenv("RESPONSE_CACHE_DB") or None,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_s > 0 and self.max_entries > 0
+
+    @staticmethod
+    def key(prompt: str, skill_hash: str, model: str) -> str:
+        material = "\0".join((model, skill_hash, normalize_prompt(prompt)))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        if not self.enabled:
+            return None
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            answer, expires_at = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.metrics["hits"] += 1
+                self.metrics["memory_hits"] += 1
+                return answer
+            del self._entries[key]
+            self.metrics["expired"] += 1
+
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT answer, expires_at FROM responses WHERE agent = ? AND key = ?",
+                (self.name, key),
+            ).fetchone()
+            if row is not None and row[1] > now:
+                self._remember(key, row[0], row[1])
+                self.metrics["hits"] += 1
+                self.metrics["disk_hits"] += 1
+                return row[0]
+
+        self.metrics["misses"] += 1
+        return None
+
+    def put(self, key: str, answer: str) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl_s
+        self._remember(key, answer, expires_at)
+        self.metrics["stores"] += 1
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (agent, key, answer, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self.name, key, answer, expires_at),
+            )
+            self._db.commit()
+
+    def _remember(self, key: str, answer: str, expires_at: float) -> None:
+        self._entries[key] = (answer, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.metrics["hits"] + self.metrics["misses"]
+        return {
+            "agent": self.name,
+            "enabled": self.enabled,
+            "ttl_s": self.ttl_s,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "persistent": self._db is not None,
+            "hit_rate": self.metrics["hits"] / lookups if lookups else 0.0,
+            **self.metrics,
+        }
+
+
+def _final_answer(events: list[Event]) -> str | None:
+    """Text of a successfully completed run, or None if it should not be cached."""
+    artifact_text: list[str] = []
+    for event in events:
+        if isinstance(event, Message) and event.role == Role.agent:
+            if (event.metadata or {}).get(ERROR_METADATA_KEY):
+                return None
+            return get_message_text(event)
+        if isinstance(event, TaskArtifactUpdateEvent):
+            artifact_text.extend(get_text_parts(event.artifact.parts))
+        if isinstance(event, TaskStatusUpdateEvent) and event.final:
+            if event.status.state != TaskState.completed:
+                return None
+            if not artifact_text and event.status.message is not None:
+                return get_message_text(event.status.message)
+    return "\n".join(artifact_text) or None
+
+
+class CachedAgentExecutor(AgentExecutor):
+    """Answers repeated prompts from a ``ResponseCache`` before ``inner`` runs."""
+
+    def __init__(
+        self,
+        inner: AgentExecutor,
+        cache: ResponseCache,
+        skill_hash: Callable[[], str],
+        model: str,
+    ) -> None:
+        self.inner = inner
+        self.cache = cache
+        # Called per request, so a reloaded skill file changes the key.
+        self.skill_hash = skill_hash
+        self.model = model
+        self._contexts: OrderedDict[str, None] = OrderedDict()
+
+    @staticmethod
+    def _bypass_requested(context: RequestContext) -> bool:
+        message_metadata = (context.message.metadata if context.message else None) or {}
+        return bool(
+            context.metadata.get(BYPASS_METADATA_KEY)
+            or message_metadata.get(BYPASS_METADATA_KEY)
+        )
+
+    def _is_follow_up(self, context_id: str | None) -> bool:
+        """Records ``context_id`` and reports whether it was seen before."""
+        if not context_id:
+            return False
+        seen = context_id in self._contexts
+        self._contexts[context_id] = None
+        self._contexts.move_to_end(context_id)
+        while len(self._contexts) > MAX_TRACKED_CONTEXTS:
+            self._contexts.popitem(last=False)
+        return seen
+
+    async def execute(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+    ) -> None:
+        if not self.cache.enabled:
+            await self.inner.execute(context, event_queue)
+            return
+        # A follow-up ("and for dental?") is neither answered from nor stored
+        # under a key that leaves out the conversation it belongs to.
+        if self._is_follow_up(context.context_id):
+            self.cache.metrics["follow_ups"] += 1
+            await self.inner.execute(context, event_queue)
+            return
+
+        key = self.cache.key(context.get_user_input(), self.skill_hash(), self.model)
+        if self._bypass_requested(context):
+            self.cache.metrics["bypassed"] += 1
+        else:
+            answer = self.cache.get(key)
+            if answer is not None:
+                await event_queue.enqueue_event(
+                    new_agent_text_message(answer, context.context_id, context.task_id)
+                )
+                return
+
+        # Record what the agent publishes through a tap on the queue, drained
+        # concurrently so a long run cannot fill the tap and stall the agent.
+        # Closing the request's queue joins its taps, hence task_done().
+        tap = event_queue.tap()
+        events: list[Event] = []
+
+        async def record() -> None:
+            while True:
+                events.append(await tap.dequeue_event())
+                tap.task_done()
+
+        recorder = asyncio.create_task(record())
+        try:
+            await self.inner.execute(context, event_queue)
+        finally:
+            recorder.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await recorder
+        with contextlib.suppress(asyncio.QueueEmpty):
+            while True:
+                events.append(await tap.dequeue_event(no_wait=True))
+                tap.task_done()
+
+        answer = _final_answer(events)
+        if answer:
+            self.cache.put(key, answer)
+
+    async def cancel(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+    ) -> None:
+        await self.inner.cancel(context, event_queue)
+
+
+def cache_stats_route(cache: ResponseCache) -> Route:
+    """``GET /cache/stats`` returning ``cache.stats()`` as JSON."""
+
+    async def stats(_: Request) -> JSONResponse:
+        return JSONResponse(cache.stats())
+
+    return Route("/cache/stats", stats, methods=["GET"])
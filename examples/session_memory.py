@@ -0,0 +1,357 @@
+"""Bounded, persistent conversation memory for the A2A servers.
+
+``UnconstrainedMemory`` keeps every message of a session, so each turn sends a
+longer prompt than the last. ``LRUMemoryManager(maxsize=100)`` drops whole
+sessions once there are more than 100 of them, however small they are, and
+all sessions are lost on restart. This module replaces both:
+
+* ``SessionMemory`` holds one conversation within a token budget. When a new
+  message pushes it over the budget, the oldest messages are dropped (a
+  sliding window). Tool results left without their tool call are dropped too,
+  so the window never starts in the middle of a tool exchange. Tokens are
+  estimated as a quarter of each message's serialized length, which also
+  counts tool calls and tool results.
+* ``SessionMemoryManager`` keeps recently used sessions in RAM up to a byte
+  budget and evicts the least recently used ones beyond it. Sessions are
+  written to a local SQLite file shortly after they change, so an evicted
+  session is reloaded on its next request and survives restarts.
+
+Configuration:
+
+    SESSION_MAX_TOKENS          Token budget per session (default: 16000).
+    SESSION_MEMORY_MAX_BYTES    RAM budget for all sessions (default: 64 MiB).
+    SESSION_STORE_PATH          SQLite file for sessions; empty keeps them in
+                                RAM only (default: data/.cache/sessions.sqlite3).
+    SESSION_STORE_TTL_S         Stored sessions idle for longer are deleted at
+                                startup (default: 604800, one week).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import math
+import os
+import sqlite3
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from beeai_framework.backend.message import (
+    AnyMessage,
+    AssistantMessage,
+    CustomMessage,
+    Role,
+    SystemMessage,
+    ToolMessage,
+    UserMessage,
+)
+from beeai_framework.memory import BaseMemory
+
+SESSION_STORE_PATH = "data/.cache/sessions.sqlite3"
+DEFAULT_MAX_TOKENS = 16_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_STORE_TTL_S = 7 * 24 * 3600
+# Changes are batched: a session is written once per turn, not per message.
+FLUSH_DELAY_S = 0.5
+
+_MESSAGE_TYPES: dict[str, type[AnyMessage]] = {
+    Role.USER.value: UserMessage,
+    Role.ASSISTANT.value: AssistantMessage,
+    Role.TOOL.value: ToolMessage,
+    Role.SYSTEM.value: SystemMessage,
+}
+
+
+def encode_message(message: AnyMessage) -> str:
+    """Serializes a message, including tool calls and results, to JSON."""
+    role = message.role.value if isinstance(message.role, Role) else message.role
+    return json.dumps(
+        {
+            "role": role,
+            "content": [part.model_dump(mode="json") for part in message.content],
+        },
+        separators=(",", ":"),
+    )
+
+
+def decode_message(data: dict[str, Any]) -> AnyMessage:
+    message_type = _MESSAGE_TYPES.get(data["role"])
+    if message_type is None:
+        return CustomMessage(data["role"], data["content"])
+    return message_type(data["content"])
+
+
+class SessionMemory(BaseMemory):
+    """Sliding-window memory that stays within ``max_tokens``."""
+
+    def __init__(self, max_tokens: int = DEFAULT_MAX_TOKENS) -> None:
+        self.max_tokens = max_tokens
+        self._messages: list[AnyMessage] = []
+        self._encoded: list[str] = []
+        self._tokens = 0
+        self._nbytes = 0
+        # Set by SessionMemoryManager: on_change persists the session after
+        # a change, on_resize keeps the manager's byte total current.
+        self.on_change: Callable[[], None] | None = None
+        self.on_resize: Callable[[int], None] | None = None
+
+    @classmethod
+    def from_env(cls) -> SessionMemory:
+        """Builds an empty memory with the ``SESSION_MAX_TOKENS`` budget."""
+        return cls(int(os.getenv("SESSION_MAX_TOKENS", str(DEFAULT_MAX_TOKENS))))
+
+    @property
+    def messages(self) -> list[AnyMessage]:
+        return self._messages
+
+    @property
+    def tokens(self) -> int:
+        """Estimated prompt tokens of the messages held."""
+        return self._tokens
+
+    @property
+    def nbytes(self) -> int:
+        """Serialized size of the messages held."""
+        return self._nbytes
+
+    def _insert(self, index: int, message: AnyMessage, encoded: str) -> None:
+        self._messages.insert(index, message)
+        self._encoded.insert(index, encoded)
+        self._tokens += math.ceil(len(encoded) / 4)
+        self._resize(len(encoded))
+
+    def _pop(self, index: int) -> None:
+        del self._messages[index]
+        encoded = self._encoded.pop(index)
+        self._tokens -= math.ceil(len(encoded) / 4)
+        self._resize(-len(encoded))
+
+    def _resize(self, delta: int) -> None:
+        self._nbytes += delta
+        if self.on_resize is not None:
+            self.on_resize(delta)
+
+    def _compact(self) -> None:
+        while self._tokens > self.max_tokens and len(self._messages) > 1:
+            self._pop(0)
+        # A tool result whose tool call was dropped is rejected by the model.
+        while self._messages and isinstance(self._messages[0], ToolMessage):
+            self._pop(0)
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
+
+    async def add(self, message: AnyMessage, index: int | None = None) -> None:
+        index = len(self._messages) if index is None else max(0, min(index, len(self._messages)))
+        self._insert(index, message, encode_message(message))
+        self._compact()
+        self._changed()
+
+    async def delete(self, message: AnyMessage) -> bool:
+        try:
+            index = self._messages.index(message)
+        except ValueError:
+            return False
+        self._pop(index)
+        self._changed()
+        return True
+
+    def reset(self) -> None:
+        self._messages.clear()
+        self._encoded.clear()
+        self._tokens = 0
+        self._resize(-self._nbytes)
+        self._changed()
+
+    async def clone(self) -> SessionMemory:
+        cloned = SessionMemory(self.max_tokens)
+        cloned._messages = self._messages.copy()
+        cloned._encoded = self._encoded.copy()
+        cloned._tokens = self._tokens
+        cloned._nbytes = self._nbytes
+        return cloned
+
+    def dumps(self) -> str:
+        """The messages as one JSON array, reusing their cached encodings."""
+        return "[" + ",".join(self._encoded) + "]"
+
+    @classmethod
+    def loads(cls, data: str, max_tokens: int) -> SessionMemory:
+        memory = cls(max_tokens)
+        for item in json.loads(data):
+            message = decode_message(item)
+            memory._insert(len(memory._messages), message, encode_message(message))
+        memory._compact()
+        return memory
+
+
+class SessionMemoryManager:
+    """Beeai ``MemoryManager`` with a RAM budget in bytes and SQLite spill.
+
+    A session that is evicted while a request still uses it stays reachable
+    through a weak reference, so that request and the next one share the same
+    memory instead of the next one loading a stale copy from disk.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        db_path: Path | None = None,
+        ttl_s: float = DEFAULT_STORE_TTL_S,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_tokens = max_tokens
+        self._resident: OrderedDict[str, SessionMemory] = OrderedDict()
+        self._live: weakref.WeakValueDictionary[str, SessionMemory] = (
+            weakref.WeakValueDictionary()
+        )
+        self._pending: dict[str, asyncio.TimerHandle | None] = {}
+        # Serialized size of the resident sessions, kept current by on_resize.
+        self._bytes = 0
+        self.metrics = {"loads": 0, "evictions": 0, "writes": 0}
+        self._db: sqlite3.Connection | None = None
+        if db_path is not None:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "key TEXT PRIMARY KEY, messages TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "DELETE FROM sessions WHERE updated_at <= ?", (time.time() - ttl_s,)
+            )
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> SessionMemoryManager:
+        """Builds the manager from the ``SESSION_*`` settings."""
+        db_path = os.getenv("SESSION_STORE_PATH", SESSION_STORE_PATH)
+        return cls(
+            max_bytes=int(os.getenv("SESSION_MEMORY_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+            max_tokens=int(os.getenv("SESSION_MAX_TOKENS", str(DEFAULT_MAX_TOKENS))),
+            db_path=Path(db_path) if db_path else None,
+            ttl_s=float(os.getenv("SESSION_STORE_TTL_S", str(DEFAULT_STORE_TTL_S))),
+        )
+
+    async def set(self, key: str, value: BaseMemory) -> None:
+        if not isinstance(value, SessionMemory):
+            memory = SessionMemory(self.max_tokens)
+            await memory.add_many(value.messages)
+            value = memory
+        self._admit(key, value)
+        self._schedule_write(key)
+
+    async def get(self, key: str) -> BaseMemory:
+        memory = self._lookup(key)
+        if memory is None:
+            raise KeyError(key)
+        return memory
+
+    async def contains(self, key: str) -> bool:
+        return self._lookup(key) is not None
+
+    def _lookup(self, key: str) -> SessionMemory | None:
+        memory = self._resident.get(key)
+        if memory is not None:
+            self._resident.move_to_end(key)
+            return memory
+        memory = self._live.get(key)
+        if memory is None and self._db is not None:
+            row = self._db.execute(
+                "SELECT messages FROM sessions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                memory = SessionMemory.loads(row[0], self.max_tokens)
+                self.metrics["loads"] += 1
+        if memory is not None:
+            self._admit(key, memory)
+        return memory
+
+    def _admit(self, key: str, memory: SessionMemory) -> None:
+        previous = self._resident.get(key)
+        if previous is not memory:
+            if previous is not None:
+                self._release(previous)
+            memory.on_change = functools.partial(self._changed, key)
+            memory.on_resize = self._resized
+            self._bytes += memory.nbytes
+            self._resident[key] = memory
+            self._live[key] = memory
+        self._resident.move_to_end(key)
+        self._evict()
+
+    def _release(self, memory: SessionMemory) -> None:
+        # A released session may still be in use; it keeps on_change so its
+        # later changes are written, but no longer counts against max_bytes.
+        memory.on_resize = None
+        self._bytes -= memory.nbytes
+
+    def _resized(self, delta: int) -> None:
+        self._bytes += delta
+
+    def _changed(self, key: str) -> None:
+        self._schedule_write(key)
+        # Checked after the change rather than per message, so the window's
+        # own compaction runs first.
+        if self._bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and len(self._resident) > 1:
+            key, memory = self._resident.popitem(last=False)
+            self._release(memory)
+            if key in self._pending:
+                self._write(key)
+            self.metrics["evictions"] += 1
+
+    def _schedule_write(self, key: str) -> None:
+        if self._db is None or key in self._pending:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._pending[key] = None
+            self._write(key)
+            return
+        self._pending[key] = loop.call_later(FLUSH_DELAY_S, self._write, key)
+
+    def _write(self, key: str) -> None:
+        handle = self._pending.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+        memory = self._resident.get(key)
+        if memory is None:
+            memory = self._live.get(key)
+        if memory is None or self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO sessions (key, messages, updated_at) VALUES (?, ?, ?)",
+            (key, memory.dumps(), time.time()),
+        )
+        self._db.commit()
+        self.metrics["writes"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sessions": len(self._resident),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "max_tokens": self.max_tokens,
+            "persistent": self._db is not None,
+            **self.metrics,
+        }
+
+    def close(self) -> None:
+        """Writes out pending changes and closes the store."""
+        for key in list(self._pending):
+            self._write(key)
+        if self._db is not None:
+            self._db.close()
+            self._db = None
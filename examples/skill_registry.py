@@ -1,8 +1,34 @@
+"""Role skills loaded from ``skills/<role>/SKILL.md``.
+
+Each directory under ``skills/`` is a role, and its ``SKILL.md`` holds the
+skill metadata (frontmatter) and guidance (body). ``SkillRegistry`` parses
+every file once and keeps the result keyed by path, modification time and
+size. The instruction block for each role is built once and handed out with
+its SHA-256, so per-request callers pay neither file I/O nor string building.
+
+The registry checks the files' modification times at most every
+``SKILL_RELOAD_INTERVAL_S`` seconds (default: 2; 0 disables reloading).
+Edited, added and removed skills are picked up without restarting the agent.
+An edit that no longer parses is logged and the last good version is kept.
+"""
+
 from __future__ import annotations
 
+import functools
+import hashlib
+import logging
+import os
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+SKILLS_DIR = Path(__file__).resolve().parent / "skills"
+SKILL_GLOB = "*/SKILL.md"
+DEFAULT_RELOAD_INTERVAL_S = 2.0
+
 
 @dataclass(frozen=True)
 class SkillDefinition:
@@ -16,12 +42,17 @@ class SkillDefinition:
     guidance: str
 
 
-ROLE_SKILL_PATHS: dict[str, tuple[Path, ...]] = {
-    "policy": (Path("skills/policy/SKILL.md"),),
-    "research": (Path("skills/research/SKILL.md"),),
-    "provider": (Path("skills/provider/SKILL.md"),),
-    "healthcare": (Path("skills/healthcare/SKILL.md"),),
-}
+@dataclass(frozen=True)
+class InstructionBlock:
+    """A role's compiled skill instructions and their SHA-256 hex digest."""
+
+    text: str
+    sha256: str
+
+    @classmethod
+    def compile(cls, skills: tuple[SkillDefinition, ...]) -> InstructionBlock:
+        text = _render_instruction_block(skills)
+        return cls(text, hashlib.sha256(text.encode("utf-8")).hexdigest())
 
 
 def _parse_skill_file(skill_path: Path) -> tuple[dict[str, str], str]:
@@ -79,19 +110,7 @@ def _load_skill_definition(skill_path: Path) -> SkillDefinition:
     )
 
 
-def get_skills(role: str) -> tuple[SkillDefinition, ...]:
-    """Returns role skills by loading role-specific SKILL.md files."""
-    role_paths = ROLE_SKILL_PATHS.get(role, ())
-    if not role_paths:
-        return ()
-
-    base_dir = Path(__file__).resolve().parent
-    return tuple(_load_skill_definition(base_dir / relative_path) for relative_path in role_paths)
-
-
-def build_instruction_block(role: str) -> str:
-    """Builds an instruction block so each example agent auto-applies SKILL.md guidance."""
-    skills = get_skills(role)
+def _render_instruction_block(skills: tuple[SkillDefinition, ...]) -> str:
     if not skills:
         return ""
 
@@ -107,3 +126,121 @@ def build_instruction_block(role: str) -> str:
 
     lines.append("Always prefer these skills when the user request matches their scope.")
     return "\n".join(lines)
+
+
+class SkillRegistry:
+    """Parsed skills for every role under ``skills_dir``, reloaded on change."""
+
+    def __init__(
+        self,
+        skills_dir: Path,
+        reload_interval_s: float = DEFAULT_RELOAD_INTERVAL_S,
+    ) -> None:
+        self.skills_dir = skills_dir
+        self.reload_interval_s = reload_interval_s
+        # Incremented whenever a reload changes any role's skills.
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._files: dict[Path, tuple[tuple[int, int], SkillDefinition]] = {}
+        self._roles: dict[str, tuple[SkillDefinition, ...]] = {}
+        self._blocks: dict[str, InstructionBlock] = {}
+        self._failed: dict[Path, tuple[int, int]] = {}
+        self._checked_at: float | None = None
+
+    @classmethod
+    def from_env(cls) -> SkillRegistry:
+        """Registry for ``SKILLS_DIR`` with the ``SKILL_RELOAD_INTERVAL_S`` setting."""
+        return cls(
+            SKILLS_DIR,
+            float(os.getenv("SKILL_RELOAD_INTERVAL_S", str(DEFAULT_RELOAD_INTERVAL_S))),
+        )
+
+    def _refresh(self) -> None:
+        # Callers hold self._lock.
+        now = time.monotonic()
+        if self._checked_at is not None and (
+            self.reload_interval_s <= 0 or now - self._checked_at < self.reload_interval_s
+        ):
+            return
+        first_load = self._checked_at is None
+        self._checked_at = now
+
+        files: dict[Path, tuple[tuple[int, int], SkillDefinition]] = {}
+        changed = False
+        for path in sorted(self.skills_dir.glob(SKILL_GLOB)):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            cached = self._files.get(path)
+            if cached is not None and cached[0] == stamp:
+                files[path] = cached
+                continue
+            if self._failed.get(path) == stamp:
+                if cached is not None:
+                    files[path] = cached
+                continue
+            try:
+                files[path] = (stamp, _load_skill_definition(path))
+            except (OSError, ValueError) as exc:
+                if first_load:
+                    raise
+                # Warn once per broken version; a half-saved edit often is one.
+                logger.warning("Keeping the previous skills for %s: %s", path, exc)
+                self._failed[path] = stamp
+                if cached is not None:
+                    files[path] = cached
+                continue
+            self._failed.pop(path, None)
+            changed = True
+
+        if changed or files.keys() != self._files.keys():
+            roles: dict[str, list[SkillDefinition]] = {}
+            for path, (_, skill) in files.items():
+                roles.setdefault(path.parent.name, []).append(skill)
+            self._files = files
+            self._roles = {role: tuple(skills) for role, skills in roles.items()}
+            self._blocks = {}
+            self.generation += 1
+
+    def roles(self) -> tuple[str, ...]:
+        """Names of the roles that have at least one skill."""
+        with self._lock:
+            self._refresh()
+            return tuple(sorted(self._roles))
+
+    def get_skills(self, role: str) -> tuple[SkillDefinition, ...]:
+        with self._lock:
+            self._refresh()
+            return self._roles.get(role, ())
+
+    def instruction_block(self, role: str) -> InstructionBlock:
+        with self._lock:
+            self._refresh()
+            block = self._blocks.get(role)
+            if block is None:
+                block = InstructionBlock.compile(self._roles.get(role, ()))
+                self._blocks[role] = block
+            return block
+
+
+@functools.cache
+def default_registry() -> SkillRegistry:
+    """The process-wide registry, created on first use after the env is loaded."""
+    return SkillRegistry.from_env()
+
+
+def get_skills(role: str) -> tuple[SkillDefinition, ...]:
+    """Returns the skills of ``role`` from its ``skills/<role>/SKILL.md``."""
+    return default_registry().get_skills(role)
+
+
+def instruction_block(role: str) -> InstructionBlock:
+    """Returns the compiled instruction block of ``role`` and its hash."""
+    return default_registry().instruction_block(role)
+
+
+def build_instruction_block(role: str) -> str:
+    """Builds an instruction block so each example agent auto-applies SKILL.md guidance."""
+    return instruction_block(role).text
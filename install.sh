@@ -14,8 +14,10 @@ echo "Installing dependencies..."
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]:-./}")" && pwd 2>/dev/null || true)"
 CONTROL_TERMINAL_SRC="${SCRIPT_DIR}/control-terminal"
 CUSTOM_AGENTS_SRC="${SCRIPT_DIR}/custom-agents.conf"
+TELEGRAM_BRIDGE_SRC="${SCRIPT_DIR}/telegram_bridge.py"
 CONTROL_TERMINAL_TMP=""
 CUSTOM_AGENTS_TMP=""
+TELEGRAM_BRIDGE_TMP=""
 
 # ----------------------------------------
 # Install tmux
@@ -64,15 +66,35 @@ if ! command -v ttyd >/dev/null 2>&1; then
       ;;
   esac
 
-  LATEST_TAG="$(curl -fsSL https://api.github.com/repos/tsl0922/ttyd/releases/latest \
-    | grep '"tag_name"' | cut -d '"' -f4)"
+  # Pinned to the version control-terminal expects, so its provisioning
+  # cache accepts this binary without downloading it again.
+  TTYD_VERSION="${CONTROL_TERMINAL_TTYD_VERSION:-1.7.7}"
+  TTYD_URL="https://github.com/tsl0922/ttyd/releases/download/${TTYD_VERSION}/${TTYD_FILE}"
 
-  TTYD_URL="https://github.com/tsl0922/ttyd/releases/download/${LATEST_TAG}/${TTYD_FILE}"
+  # SHA-256 of each pinned release asset; keep in sync with control-terminal.
+  # CONTROL_TERMINAL_TTYD_SHA256 overrides it; an empty pin only warns.
+  declare -A PINNED_SHA256=(
+    ["ttyd/1.7.7/ttyd.x86_64"]=""
+    ["ttyd/1.7.7/ttyd.aarch64"]=""
+  )
+  TTYD_EXPECTED="${CONTROL_TERMINAL_TTYD_SHA256:-${PINNED_SHA256["ttyd/$TTYD_VERSION/$TTYD_FILE"]:-}}"
 
   echo "Downloading $TTYD_URL"
-  curl -fL "$TTYD_URL" -o "$HOME/.control-terminal/bin/ttyd"
+  curl -fL --connect-timeout 10 --retry 2 "$TTYD_URL" -o "$HOME/.control-terminal/bin/ttyd"
+
+  TTYD_SHA256="$(sha256sum "$HOME/.control-terminal/bin/ttyd" | awk '{print $1}')"
+  if [ -z "$TTYD_EXPECTED" ]; then
+    echo "⚠️ No pinned checksum for ttyd $TTYD_VERSION ($TTYD_FILE); set CONTROL_TERMINAL_TTYD_SHA256 to verify it"
+  elif [ "$TTYD_SHA256" != "$TTYD_EXPECTED" ]; then
+    rm -f "$HOME/.control-terminal/bin/ttyd"
+    echo "❌ ttyd checksum mismatch: expected $TTYD_EXPECTED, got $TTYD_SHA256"
+    exit 1
+  fi
 
   chmod +x "$HOME/.control-terminal/bin/ttyd"
+  MANIFEST="$HOME/.control-terminal/bin/manifest"
+  { [ -f "$MANIFEST" ] && awk '$1 != "ttyd"' "$MANIFEST"; echo "ttyd $TTYD_VERSION $TTYD_SHA256 $TTYD_URL"; } >"${MANIFEST}.tmp"
+  mv "${MANIFEST}.tmp" "$MANIFEST"
 
   # Persist PATH
   if ! grep -qs 'control-terminal/bin' "$HOME/.bashrc" 2>/dev/null; then
@@ -105,6 +127,33 @@ if [ -n "$CONTROL_TERMINAL_TMP" ] && [ -f "$CONTROL_TERMINAL_TMP" ]; then
   rm -f "$CONTROL_TERMINAL_TMP"
 fi
 
+# ----------------------------------------
+# Install Python Telegram bridge
+# ----------------------------------------
+mkdir -p "$HOME/.control-terminal"
+
+if [ ! -f "$TELEGRAM_BRIDGE_SRC" ]; then
+  TELEGRAM_BRIDGE_TMP="$(mktemp)"
+  curl -fsSL \
+    "https://raw.githubusercontent.com/kumar045/Control-PC-Terminal/main/telegram_bridge.py" \
+    -o "$TELEGRAM_BRIDGE_TMP" || true
+  if [ -s "$TELEGRAM_BRIDGE_TMP" ]; then
+    TELEGRAM_BRIDGE_SRC="$TELEGRAM_BRIDGE_TMP"
+  fi
+fi
+
+if [ -f "$TELEGRAM_BRIDGE_SRC" ]; then
+  cp "$TELEGRAM_BRIDGE_SRC" "$HOME/.control-terminal/telegram_bridge.py"
+  chmod 755 "$HOME/.control-terminal/telegram_bridge.py"
+  echo "Installed Telegram bridge at ~/.control-terminal/telegram_bridge.py"
+else
+  echo "⚠️ Telegram bridge not installed; control-terminal will use the shell bridge."
+fi
+
+if [ -n "$TELEGRAM_BRIDGE_TMP" ] && [ -f "$TELEGRAM_BRIDGE_TMP" ]; then
+  rm -f "$TELEGRAM_BRIDGE_TMP"
+fi
+
 # ----------------------------------------
 # Install preconfigured custom-agent template
 # ----------------------------------------
@@ -0,0 +1,1820 @@
+#!/usr/bin/env python3
+"""Long-lived Telegram bridge for control-terminal.
+
+This replaces the shell ``getUpdates`` loop in ``control-terminal``. A single
+asyncio process keeps pooled keep-alive HTTPS connections to the Bot API,
+long-polls for updates, parses them in-process and relays commands to one or
+more tmux sessions. Only the Python standard library is used.
+
+Configuration comes from the environment so the bot token never shows up in
+``ps`` output:
+
+    TELEGRAM_BOT_TOKEN           Bot token from @BotFather (required).
+    TELEGRAM_ALLOWED_CHAT_ID     Chat allowed to control the session, or a
+                                 comma-separated allowlist of chats (required).
+    CONTROL_TERMINAL_SESSION     tmux session name (default: control-terminal).
+    CONTROL_TERMINAL_SESSIONS    Comma-separated tmux sessions to multiplex; chats
+                                 switch between them with /use (default: the
+                                 single CONTROL_TERMINAL_SESSION).
+    TELEGRAM_AUTO_WATCH_SECONDS  Default /watch interval (default: 2).
+    TELEGRAM_PROMPT_MAX_WAIT     Max seconds to wait for a prompt reply (default: 10).
+    TELEGRAM_CAPTURE_MODE        ``stream`` (tmux pipe-pane, default) or ``poll``.
+    TELEGRAM_SCROLLBACK_MB       Memory cap of the streamed output log (default: 8).
+    TELEGRAM_WATCH_MODE          ``live`` (edit one pinned message, default) or
+                                 ``messages`` (one new message per update).
+    TELEGRAM_RATE_PER_CHAT       Outbound requests per second per chat (default: 1).
+    TELEGRAM_RATE_GLOBAL         Outbound requests per second overall (default: 25).
+    TELEGRAM_QUEUE_MAX           Pending outbound requests kept (default: 500).
+    TELEGRAM_DOCUMENT_THRESHOLD  Replies longer than this many characters are
+                                 uploaded as a gzip .txt document (default: 12000).
+    TELEGRAM_API_BASE            Bot API base URL (default: api.telegram.org).
+    CONTROL_TERMINAL_STATE_DIR   Directory with the launcher's component state
+                                 files; the bridge reports them in /health and
+                                 serves its own health as JSON on
+                                 ``bridge.sock`` there.
+
+Point ``TELEGRAM_API_BASE`` at a local ``http://`` stub server to exercise the
+bridge without talking to Telegram. ``telegram_bridge.py --status SOCKET``
+prints the health summary of a running bridge.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import gzip
+import json
+import logging
+import os
+import re
+import shlex
+import signal
+import socket
+import ssl
+import sys
+import tempfile
+import time
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass, field, replace
+from typing import Any
+from urllib.parse import urlsplit
+
+DEFAULT_API_BASE = "https://api.telegram.org"
+DEFAULT_SESSION = "control-terminal"
+LONG_POLL_TIMEOUT_S = 30
+REQUEST_TIMEOUT_S = 15.0
+MAX_MESSAGE_CHARS = 3800
+TELEGRAM_TEXT_LIMIT = 4096
+PROMPT_REPLY_LINES = 30
+PANE_POLL_INTERVAL_S = 0.25
+# A reply is sent once the pane changed and then stayed quiet for this long.
+PROMPT_SETTLE_S = 0.75
+
+# A pane that never prints a newline is flushed into the log at this size.
+MAX_PARTIAL_LINE_BYTES = 64 * 1024
+MAX_TAIL_LINES = 5000
+# Lines of context a new /watch starts with before following new output.
+WATCH_CONTEXT_LINES = 40
+TAIL_RANGE_RE = re.compile(r"^(\d+)-(\d+)$")
+# Edits of a live message are coalesced to at most one per this many seconds.
+LIVE_EDIT_MIN_INTERVAL_S = 1.5
+# Body budget of a live message; past it the view rolls over to a new message.
+LIVE_BODY_CHARS = MAX_MESSAGE_CHARS - 200
+WATCH_MODES = ("live", "messages")
+# Quiet watchers re-check that the pipe is still attached this often.
+CAPTURE_RECHECK_S = 30.0
+# Watchers of a polled session share one capture-pane snapshot this long.
+SHARED_SNAPSHOT_TTL_S = 1.0
+STATUS_SOCKET_NAME = "bridge.sock"
+# Exit status for "cannot run with this configuration"; control-terminal's
+# supervisor does not restart it (COMPONENT_EXIT_DISABLED, EX_CONFIG).
+EXIT_DISABLED = 78
+
+ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*[JKmsu]")
+# Full terminal escape grammar for the raw pipe-pane stream: OSC strings, CSI
+# sequences and the remaining two-byte escapes.
+TERMINAL_ESCAPE_RE = re.compile(
+    r"\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)?|\x1b\[[0-?]*[ -/]*[@-~]|\x1b[@-Z\\-_]|\x1b.?"
+)
+CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+
+logger = logging.getLogger("control-terminal.bridge")
+
+
+class BotApiError(RuntimeError):
+    """Raised when the Bot API cannot be reached or returns a malformed reply."""
+
+
+class TokenRejected(BotApiError):
+    """Raised when the Bot API answers ``getMe`` with ``ok: false``."""
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection to the Bot API host."""
+
+    def __init__(self, host: str, port: int, ssl_context: ssl.SSLContext | None) -> None:
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def open(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host,
+            self.port,
+            ssl=self.ssl_context,
+            server_hostname=self.host if self.ssl_context else None,
+        )
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = None
+        self.writer = None
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+    ) -> tuple[int, bytes]:
+        if not self.is_open:
+            await self.open()
+        assert self.reader is not None and self.writer is not None
+
+        head = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}",
+            "Connection: keep-alive",
+            f"Content-Length: {len(body)}",
+        ]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by peer")
+        status = int(status_line.split(b" ", 2)[1])
+
+        response_headers: dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            payload = await self._read_chunked()
+        elif "content-length" in response_headers:
+            payload = await self.reader.readexactly(int(response_headers["content-length"]))
+        else:
+            payload = await self.reader.read()
+            self.close()
+
+        if response_headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, payload
+
+    async def _read_chunked(self) -> bytes:
+        assert self.reader is not None
+        chunks = []
+        while True:
+            size_line = await self.reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # Skip optional trailers up to the terminating blank line.
+                while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+
+def _encode_multipart(
+    fields: dict[str, Any], files: dict[str, tuple[str, bytes, str]]
+) -> tuple[bytes, str]:
+    boundary = f"control-terminal-{os.urandom(12).hex()}"
+    parts = []
+    for name, value in fields.items():
+        value = value if isinstance(value, str) else json.dumps(value)
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n".encode()
+        )
+    for name, (filename, content, content_type) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; '
+            f'filename="{filename}"\r\nContent-Type: {content_type}\r\n\r\n'.encode()
+            + content
+            + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def split_message(text: str, limit: int = MAX_MESSAGE_CHARS) -> list[str]:
+    """Splits text into chunks of at most ``limit`` characters on line boundaries.
+
+    Only a single line longer than ``limit`` is cut mid-line.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in text.split("\n"):
+        while len(line) > limit:
+            if current:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            chunks.append(line[:limit])
+            line = line[limit:]
+        if current and size + len(line) + 1 > limit:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+class BotApiClient:
+    """Minimal async Telegram Bot API client with a keep-alive connection pool."""
+
+    def __init__(self, token: str, api_base: str = DEFAULT_API_BASE, pool_size: int = 4) -> None:
+        self.pool_size = pool_size
+        parts = urlsplit(api_base)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported Bot API base URL: {api_base}")
+
+        use_tls = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if use_tls else 80)
+        self.ssl_context = ssl.create_default_context() if use_tls else None
+        self.path_prefix = f"{parts.path.rstrip('/')}/bot{token}"
+        self._idle: list[_Connection] = []
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def call(
+        self,
+        method: str,
+        params: dict[str, Any] | None = None,
+        *,
+        files: dict[str, tuple[str, bytes, str]] | None = None,
+        timeout: float = REQUEST_TIMEOUT_S,
+    ) -> dict[str, Any]:
+        """Invokes a Bot API method and returns the decoded JSON reply.
+
+        ``files`` maps a field name to ``(filename, content, content_type)``
+        and switches the request to multipart/form-data. The reply is returned
+        even when ``ok`` is false so callers can inspect ``error_code`` and
+        ``parameters``. Transport failures raise BotApiError.
+        """
+        if files:
+            body, content_type = _encode_multipart(params or {}, files)
+        else:
+            body, content_type = json.dumps(params or {}).encode("utf-8"), "application/json"
+        path = f"{self.path_prefix}/{method}"
+
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else _Connection(
+                self.host, self.port, self.ssl_context
+            )
+            try:
+                _, payload = await asyncio.wait_for(
+                    self._send(conn, path, body, content_type), timeout
+                )
+            except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+                conn.close()
+                raise BotApiError(f"{method} failed: {exc!r}") from exc
+            except asyncio.CancelledError:
+                # A half-read response would poison the next request on this socket.
+                conn.close()
+                raise
+            if conn.is_open:
+                self._idle.append(conn)
+
+        try:
+            data = json.loads(payload)
+        except ValueError as exc:
+            raise BotApiError(f"{method} returned invalid JSON") from exc
+        if not isinstance(data, dict):
+            raise BotApiError(f"{method} returned an unexpected payload")
+        return data
+
+    async def _send(
+        self, conn: _Connection, path: str, body: bytes, content_type: str
+    ) -> tuple[int, bytes]:
+        headers = {"Content-Type": content_type}
+        reused = conn.is_open
+        try:
+            return await conn.request("POST", path, body, headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            if not reused:
+                raise
+            # The server may have dropped an idle keep-alive connection; retry once.
+            conn.close()
+            return await conn.request("POST", path, body, headers)
+
+    async def close(self) -> None:
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second, holding at most ``burst``."""
+
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self.wait_time(now)
+        self.tokens -= 1
+
+
+@dataclass
+class _Outbound:
+    method: str
+    params: dict[str, Any]
+    chat_id: str
+    coalesce: str | None
+    futures: list[asyncio.Future[dict[str, Any] | None]] = field(default_factory=list)
+    files: dict[str, tuple[str, bytes, str]] | None = None
+    attempts: int = 0
+    not_before: float = 0.0
+
+
+class OutboundQueue:
+    """Rate-limited delivery queue for every Bot API write the bridge makes.
+
+    The worker delivers up to ``max_inflight`` requests at once, but only one
+    per chat, so a slow upload to one chat does not hold up the others and
+    each chat still sees its messages in order. It honours per-chat and
+    global token buckets and the ``retry_after`` of HTTP 429 replies. Other
+    error replies (blocked bot, message too long) are counted as failed and
+    logged; they are not retried. Transport failures are retried with
+    exponential backoff instead of being dropped. A request submitted with a
+    ``coalesce`` key is merged into the chat's newest pending request with
+    the same key, so a stream backlog built up during a flood wait goes out
+    as one message. Once ``max_pending`` requests wait, only such stream
+    updates are shed; other new requests are rejected rather than evicting
+    replies users are already waiting for.
+    """
+
+    def __init__(
+        self,
+        client: BotApiClient,
+        *,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        global_rate: float = 25.0,
+        max_pending: int = 500,
+        max_attempts: int = 5,
+        max_inflight: int | None = None,
+    ) -> None:
+        self.client = client
+        # One pooled connection stays free for the getUpdates long poll.
+        self.max_inflight = max_inflight or max(client.pool_size - 1, 1)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.stats = {
+            "sent": 0,
+            "failed": 0,
+            "retried": 0,
+            "rate_limited": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "rejected": 0,
+        }
+        self._pending: deque[_Outbound] = deque()
+        self._wakeup = asyncio.Event()
+        now = asyncio.get_running_loop().time()
+        self._global_bucket = TokenBucket(global_rate, global_rate, now)
+        self._chat_buckets: dict[str, TokenBucket] = {}
+        self._chat_blocked_until: dict[str, float] = {}
+        self._busy_chats: set[str] = set()
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def summary(self) -> str:
+        stats = self.stats
+        return (
+            f"depth {self.depth}, in flight {len(self._busy_chats)}, sent {stats['sent']}, "
+            f"failed {stats['failed']}, retried {stats['retried']}, "
+            f"rate-limited {stats['rate_limited']}, coalesced {stats['coalesced']}, "
+            f"dropped {stats['dropped']}, rejected {stats['rejected']}"
+        )
+
+    async def call(
+        self,
+        method: str,
+        params: dict[str, Any],
+        *,
+        coalesce: str | None = None,
+        files: dict[str, tuple[str, bytes, str]] | None = None,
+    ) -> dict[str, Any] | None:
+        """Queues a request and waits for Telegram's reply (None if dropped or rejected)."""
+        return await self.submit(method, params, coalesce=coalesce, files=files)
+
+    def submit(
+        self,
+        method: str,
+        params: dict[str, Any],
+        *,
+        coalesce: str | None = None,
+        files: dict[str, tuple[str, bytes, str]] | None = None,
+    ) -> asyncio.Future[dict[str, Any] | None]:
+        future: asyncio.Future[dict[str, Any] | None] = asyncio.get_running_loop().create_future()
+        chat_id = str(params.get("chat_id", ""))
+
+        if coalesce is not None:
+            newest = next((req for req in reversed(self._pending) if req.chat_id == chat_id), None)
+            if newest is not None and newest.coalesce == coalesce:
+                merged = self._merge(newest, params)
+                if merged is not None:
+                    newest.params = merged
+                    newest.futures.append(future)
+                    self.stats["coalesced"] += 1
+                    return future
+
+        request = _Outbound(method, params, chat_id, coalesce, [future], files)
+        if len(self._pending) >= self.max_pending and not self._make_room(request):
+            return future
+        self._pending.append(request)
+        self._wakeup.set()
+        return future
+
+    @staticmethod
+    def _merge(request: _Outbound, params: dict[str, Any]) -> dict[str, Any] | None:
+        if request.method == "editMessageText":
+            # An edit renders the whole message: the newest one wins.
+            return {**request.params, **params}
+        if request.method == "sendMessage":
+            older, newer = request.params["text"], params["text"]
+            header, _, body = newer.partition("\n")
+            if body and older.partition("\n")[0] == header:
+                newer = body
+            text = f"{older}\n{newer}"
+            if len(text) <= TELEGRAM_TEXT_LIMIT:
+                return {**request.params, "text": text}
+        return None
+
+    def _make_room(self, incoming: _Outbound) -> bool:
+        """Sheds a stream update for ``incoming``; False if it is not queued.
+
+        Only coalescable live-view and /watch traffic is dropped, so prompt
+        replies and command answers already queued are never evicted. With
+        none of that left, ``incoming`` is shed itself, or rejected when it
+        is not a stream update either.
+        """
+        victim = next((req for req in self._pending if req.coalesce is not None), None)
+        if victim is not None:
+            self._pending.remove(victim)
+        elif incoming.coalesce is not None:
+            victim = incoming
+        else:
+            self.stats["rejected"] += 1
+            logger.warning(
+                "Outbound queue full; rejecting %s to chat %s", incoming.method, incoming.chat_id
+            )
+            self._resolve(incoming, None)
+            return False
+        self.stats["dropped"] += 1
+        self._resolve(victim, None)
+        return victim is not incoming
+
+    @staticmethod
+    def _resolve(request: _Outbound, reply: dict[str, Any] | None) -> None:
+        for future in request.futures:
+            if not future.done():
+                future.set_result(reply)
+
+    def _chat_bucket(self, chat_id: str, now: float) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst, now)
+        return bucket
+
+    def _next_ready(self, now: float) -> tuple[_Outbound | None, float | None]:
+        """Returns a deliverable request, or None and how long to wait for one."""
+        global_wait = self._global_bucket.wait_time(now)
+        earliest: float | None = None
+        visited: set[str] = set()
+        for request in list(self._pending):
+            if all(future.cancelled() for future in request.futures):
+                self._pending.remove(request)
+                continue
+            if request.chat_id in visited:
+                continue
+            # Only a chat's oldest request is eligible, and only while nothing
+            # else is in flight to that chat, which keeps chat order.
+            visited.add(request.chat_id)
+            if request.chat_id in self._busy_chats:
+                continue
+            wait = max(
+                global_wait,
+                request.not_before - now,
+                self._chat_blocked_until.get(request.chat_id, 0.0) - now,
+                self._chat_bucket(request.chat_id, now).wait_time(now),
+            )
+            if wait <= 0:
+                return request, None
+            earliest = wait if earliest is None else min(earliest, wait)
+        return None, earliest
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        deliveries: set[asyncio.Task[None]] = set()
+
+        def finished(task: asyncio.Task[None], chat_id: str) -> None:
+            deliveries.discard(task)
+            self._busy_chats.discard(chat_id)
+            self._wakeup.set()
+
+        try:
+            while True:
+                request: _Outbound | None = None
+                wait: float | None = None
+                if len(deliveries) < self.max_inflight:
+                    request, wait = self._next_ready(loop.time())
+                if request is None:
+                    # Woken by submit(), a finished delivery or the next token.
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                self._pending.remove(request)
+                self._busy_chats.add(request.chat_id)
+                task = asyncio.create_task(self._deliver(request, loop))
+                deliveries.add(task)
+                task.add_done_callback(functools.partial(finished, chat_id=request.chat_id))
+        finally:
+            for task in deliveries:
+                task.cancel()
+
+    async def _deliver(self, request: _Outbound, loop: asyncio.AbstractEventLoop) -> None:
+        now = loop.time()
+        self._global_bucket.take(now)
+        self._chat_bucket(request.chat_id, now).take(now)
+        try:
+            reply = await self.client.call(request.method, request.params, files=request.files)
+        except BotApiError as exc:
+            request.attempts += 1
+            if request.attempts >= self.max_attempts:
+                logger.warning(
+                    "Dropping %s after %d attempts: %s", request.method, request.attempts, exc
+                )
+                self.stats["dropped"] += 1
+                self._resolve(request, None)
+                return
+            self.stats["retried"] += 1
+            request.not_before = loop.time() + min(2.0**request.attempts, 30.0)
+            self._pending.appendleft(request)
+            return
+
+        if reply.get("error_code") == 429:
+            retry_after = float((reply.get("parameters") or {}).get("retry_after", 1))
+            self.stats["rate_limited"] += 1
+            self._chat_blocked_until[request.chat_id] = loop.time() + retry_after
+            self._pending.appendleft(request)
+            return
+
+        if reply.get("ok"):
+            self.stats["sent"] += 1
+        else:
+            self.stats["failed"] += 1
+            logger.warning(
+                "%s to chat %s failed: %s %s",
+                request.method,
+                request.chat_id,
+                reply.get("error_code"),
+                reply.get("description", ""),
+            )
+        self._resolve(request, reply)
+
+
+async def run_tmux(*args: str) -> tuple[int, str]:
+    """Runs a tmux command and returns its exit code and decoded stdout."""
+    proc = await asyncio.create_subprocess_exec(
+        "tmux",
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    stdout, _ = await proc.communicate()
+    return proc.returncode or 0, stdout.decode("utf-8", "replace")
+
+
+class TmuxSession:
+    """Thin async wrapper around the tmux commands the bridge needs."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    async def exists(self) -> bool:
+        code, _ = await run_tmux("has-session", "-t", self.name)
+        return code == 0
+
+    async def send_keys(self, *keys: str, literal: bool = False) -> None:
+        args = ["send-keys", "-t", self.name]
+        if literal:
+            args.append("-l")
+        await run_tmux(*args, *keys)
+
+    async def capture(self, lines: int) -> str:
+        """Returns the last ``lines`` non-trailing-blank lines of the pane."""
+        code, output = await run_tmux("capture-pane", "-t", self.name, "-p")
+        if code != 0:
+            return ""
+        rows = ANSI_ESCAPE_RE.sub("", output).rstrip("\n").split("\n")
+        while rows and not rows[-1].strip():
+            rows.pop()
+        return "\n".join(rows[-lines:])
+
+    async def wait_for_output(self, baseline: str, lines: int, max_wait: float) -> str:
+        """Waits until the pane changes from ``baseline`` and settles.
+
+        Returns as soon as the capture has differed from ``baseline`` and then
+        stayed unchanged for PROMPT_SETTLE_S, or after ``max_wait`` seconds.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        current = baseline
+        changed_at: float | None = None
+        while loop.time() < deadline:
+            await asyncio.sleep(PANE_POLL_INTERVAL_S)
+            snapshot = await self.capture(lines)
+            if snapshot != current:
+                current = snapshot
+                changed_at = loop.time()
+            elif changed_at is not None and loop.time() - changed_at >= PROMPT_SETTLE_S:
+                break
+        return current
+
+
+def terminal_text(raw: bytes) -> str:
+    """Renders raw pane bytes as plain text lines.
+
+    Escape sequences and control characters are dropped and a bare carriage
+    return overwrites the line, which is how progress bars and spinners redraw.
+    """
+    text = TERMINAL_ESCAPE_RE.sub("", raw.decode("utf-8", "replace"))
+    lines = [line.rstrip("\r").rsplit("\r", 1)[-1] for line in text.split("\n")]
+    return CONTROL_CHARS_RE.sub("", "\n".join(lines))
+
+
+class OutputLog:
+    """Bounded scrollback of pane output lines numbered by a monotonic sequence.
+
+    Completed lines get consecutive sequence numbers starting at 1. Once the
+    lines use more than ``max_bytes`` of memory the oldest are evicted, so
+    ``first_seq`` moves forward while sequence numbers themselves never change.
+    Any range is a list slice, and a reader that remembers the last sequence it
+    saw can catch up with exactly the lines it missed.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.first_seq = 1
+        self._lines: list[str] = []
+        self._head = 0
+        self._partial = b""
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest completed line (0 when empty)."""
+        return self.first_seq + len(self._lines) - self._head - 1
+
+    @property
+    def partial(self) -> str:
+        """The line currently being written, e.g. an interactive prompt."""
+        return terminal_text(self._partial)
+
+    def feed(self, data: bytes) -> None:
+        """Splits raw pane bytes into lines and appends the completed ones."""
+        *complete, self._partial = (self._partial + data).split(b"\n")
+        if len(self._partial) > MAX_PARTIAL_LINE_BYTES:
+            complete.append(self._partial)
+            self._partial = b""
+        if complete:
+            for line in terminal_text(b"\n".join(complete)).split("\n"):
+                self._append(line)
+
+    def _append(self, line: str) -> None:
+        self._lines.append(line)
+        self.size += sys.getsizeof(line)
+        while self.size > self.max_bytes and self._head < len(self._lines):
+            self.size -= sys.getsizeof(self._lines[self._head])
+            self._head += 1
+            self.first_seq += 1
+        # Compact lazily so eviction stays O(1) amortised.
+        if self._head > 4096 and self._head * 2 > len(self._lines):
+            del self._lines[: self._head]
+            self._head = 0
+
+    def lines(self, start: int, end: int | None = None) -> Iterator[tuple[int, str]]:
+        """Yields ``(seq, line)`` for sequence numbers in ``[start, end]``."""
+        start = max(start, self.first_seq)
+        end = self.last_seq if end is None else min(end, self.last_seq)
+        offset = self._head - self.first_seq
+        for index in range(start + offset, end + offset + 1):
+            yield index - offset, self._lines[index]
+
+    def tail(self, count: int) -> list[str]:
+        rows = [line for _, line in self.lines(self.last_seq - count + 1)]
+        partial = self.partial
+        if partial.strip():
+            rows = [*rows[1:], partial] if len(rows) >= count else [*rows, partial]
+        while rows and not rows[-1].strip():
+            rows.pop()
+        return rows
+
+
+class PaneCapture:
+    """Streams a session's pane output into memory through ``tmux pipe-pane``.
+
+    tmux writes every byte the pane prints into a FIFO owned by the bridge, so
+    watchers wake up as soon as output arrives and nothing runs while the
+    session is quiet. Output that scrolls past between renders is kept.
+    """
+
+    def __init__(self, tmux: TmuxSession, scrollback_bytes: int) -> None:
+        self.tmux = tmux
+        self.log = OutputLog(scrollback_bytes)
+        self.version = 0
+        self._event = asyncio.Event()
+        self._workdir: str | None = None
+        self._fifo: str | None = None
+        self._read_fd: int | None = None
+        self._keepalive_fd: int | None = None
+
+    async def start(self) -> bool:
+        """Attaches the pipe and primes the log; False if tmux refused."""
+        if self._read_fd is None:
+            self._workdir = tempfile.mkdtemp(prefix="control-terminal-capture.")
+            self._fifo = os.path.join(self._workdir, "pane.fifo")
+            os.mkfifo(self._fifo, 0o600)
+            self._read_fd = os.open(self._fifo, os.O_RDONLY | os.O_NONBLOCK)
+            # Holding a write end ourselves means the FIFO never reports EOF
+            # when tmux restarts the pipe command.
+            self._keepalive_fd = os.open(self._fifo, os.O_WRONLY | os.O_NONBLOCK)
+            asyncio.get_running_loop().add_reader(self._read_fd, self._on_readable)
+
+            snapshot = await self.tmux.capture(200)
+            if snapshot:
+                self._append(snapshot.encode("utf-8") + b"\n")
+
+        return await self.ensure_attached()
+
+    async def ensure_attached(self) -> bool:
+        """Re-attaches the pipe if the pane lost it (e.g. the session restarted)."""
+        if self._fifo is None:
+            return False
+        code, output = await run_tmux("display-message", "-p", "-t", self.tmux.name, "#{pane_pipe}")
+        if code == 0 and output.strip() == "1":
+            return True
+        code, _ = await run_tmux(
+            "pipe-pane", "-O", "-t", self.tmux.name, f"exec cat > {shlex.quote(self._fifo)}"
+        )
+        return code == 0
+
+    async def stop(self) -> None:
+        if self._read_fd is None:
+            return
+        try:
+            await run_tmux("pipe-pane", "-t", self.tmux.name)
+        finally:
+            # Runs even if the detach is cancelled, so no FIFO is left behind.
+            asyncio.get_running_loop().remove_reader(self._read_fd)
+            for fd in (self._read_fd, self._keepalive_fd):
+                if fd is not None:
+                    os.close(fd)
+            self._read_fd = self._keepalive_fd = None
+            if self._fifo is not None:
+                os.unlink(self._fifo)
+            if self._workdir is not None:
+                os.rmdir(self._workdir)
+            self._fifo = self._workdir = None
+
+    def _on_readable(self) -> None:
+        assert self._read_fd is not None
+        try:
+            data = os.read(self._read_fd, 65536)
+        except BlockingIOError:
+            return
+        if data:
+            self._append(data)
+
+    def _append(self, data: bytes) -> None:
+        self.log.feed(data)
+        self.version += 1
+        # Wake every waiter at once; later waiters pick up the fresh event.
+        self._event.set()
+        self._event = asyncio.Event()
+
+    async def wait_for_output(self, since: int, timeout: float | None = None) -> int:
+        """Waits for output newer than version ``since`` and returns the new version."""
+        if self.version == since:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.version
+
+    def tail(self, lines: int) -> str:
+        return "\n".join(self.log.tail(lines))
+
+
+class LiveMessage:
+    """The pinned "live" message of one chat, updated in place.
+
+    ``show`` edits the current message with editMessageText and only sends a
+    new one when there is none yet, after ``rollover`` or when Telegram lost
+    the old one. Identical renders are skipped, since Telegram rejects them.
+    """
+
+    def __init__(self, bridge: TelegramBridge, chat_id: str) -> None:
+        self.bridge = bridge
+        self.chat_id = chat_id
+        self.message_id: int | None = None
+        self.pinned_id: int | None = None
+        self.text = ""
+
+    async def show(self, text: str) -> bool:
+        if self.message_id is not None:
+            if text == self.text:
+                return True
+            reply = await self.bridge.api(
+                "editMessageText",
+                {"chat_id": self.chat_id, "message_id": self.message_id, "text": text},
+                coalesce=f"live:{self.message_id}",
+            )
+            if reply is None:
+                return False
+            description = str(reply.get("description", ""))
+            if reply.get("ok") or "not modified" in description:
+                self.text = text
+                return True
+            if reply.get("error_code") != 400:
+                return False
+            # The message was deleted or is too old to edit: start a fresh one.
+            self.message_id = None
+
+        reply = await self.bridge.api("sendMessage", {"chat_id": self.chat_id, "text": text})
+        if not reply or not reply.get("ok"):
+            return False
+        self.message_id = reply["result"]["message_id"]
+        self.text = text
+        await self._pin(self.message_id)
+        return True
+
+    def rollover(self) -> None:
+        """Freezes the current message; the next ``show`` starts a new one."""
+        self.message_id = None
+        self.text = ""
+
+    async def _pin(self, message_id: int) -> None:
+        self.unpin()
+        reply = await self.bridge.api(
+            "pinChatMessage",
+            {"chat_id": self.chat_id, "message_id": message_id, "disable_notification": True},
+        )
+        if reply and reply.get("ok"):
+            self.pinned_id = message_id
+
+    def unpin(self) -> None:
+        """Queues the unpin without waiting; the chat's queue keeps it in order."""
+        if self.pinned_id is not None:
+            self.bridge.outbox.submit(
+                "unpinChatMessage", {"chat_id": self.chat_id, "message_id": self.pinned_id}
+            )
+            self.pinned_id = None
+
+
+class AgentSession:
+    """One tmux agent session with its own capture and prompt queue.
+
+    Every chat watching the session reads the same capture, so N watchers
+    cost one pipe (or one capture-pane per tick when polling) plus N sends.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.tmux = TmuxSession(name)
+        # None when running in poll mode or when tmux refused pipe-pane.
+        self.capture: PaneCapture | None = None
+        self._snapshot: tuple[float, int, str] | None = None
+        # Prompts are typed into the pane strictly in order by one worker per
+        # session, so the update loop stays free to serve /interrupt and friends.
+        self.prompt_queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
+        self.prompt_worker: asyncio.Task[None] | None = None
+        self.prompt_busy = False
+
+    async def start_capture(self, scrollback_bytes: int) -> None:
+        if not await self.tmux.exists():
+            return
+        capture = PaneCapture(self.tmux, scrollback_bytes)
+        if await capture.start():
+            self.capture = capture
+        else:
+            await capture.stop()
+            logger.warning(
+                "tmux pipe-pane unavailable for %s; falling back to capture-pane polling",
+                self.name,
+            )
+
+    async def tail_output(self, lines: int) -> str:
+        if self.capture is not None:
+            return self.capture.tail(lines)
+        return await self.tmux.capture(lines)
+
+    async def shared_tail(self, lines: int) -> str:
+        """``tail_output`` for watchers; polled captures are reused for a second."""
+        if self.capture is not None:
+            return self.capture.tail(lines)
+        now = asyncio.get_running_loop().time()
+        if self._snapshot is not None:
+            taken_at, taken_lines, text = self._snapshot
+            if taken_lines == lines and now - taken_at < SHARED_SNAPSHOT_TTL_S:
+                return text
+        text = await self.tmux.capture(lines)
+        self._snapshot = (now, lines, text)
+        return text
+
+    async def close(self) -> None:
+        if self.prompt_worker is not None:
+            self.prompt_worker.cancel()
+        if self.capture is not None:
+            await self.capture.stop()
+
+
+@dataclass
+class Watcher:
+    """A chat's /watch subscription to one session."""
+
+    chat_id: str
+    agent: AgentSession
+    interval: int
+    mode: str
+    task: asyncio.Task[None] | None = None
+
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+        self.task = None
+
+
+@dataclass(frozen=True)
+class BridgeConfig:
+    """Runtime settings for the bridge, normally taken from the environment."""
+
+    token: str
+    allowed_chat_ids: tuple[str, ...]
+    session: str = DEFAULT_SESSION
+    # Every session the bridge multiplexes; empty means just ``session``.
+    sessions: tuple[str, ...] = ()
+    auto_watch_seconds: int = 2
+    prompt_max_wait: float = 10.0
+    capture_mode: str = "stream"
+    scrollback_mb: float = 8.0
+    watch_mode: str = "live"
+    rate_per_chat: float = 1.0
+    rate_global: float = 25.0
+    queue_max: int = 500
+    document_threshold: int = 12000
+    api_base: str = DEFAULT_API_BASE
+    state_dir: str = ""
+
+    @property
+    def session_names(self) -> tuple[str, ...]:
+        return self.sessions or (self.session,)
+
+    @classmethod
+    def from_env(cls) -> BridgeConfig:
+        token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
+        allowed_chat_ids = _split_names(os.environ.get("TELEGRAM_ALLOWED_CHAT_ID", ""))
+        if not token or not allowed_chat_ids:
+            raise ValueError("TELEGRAM_BOT_TOKEN and TELEGRAM_ALLOWED_CHAT_ID are required")
+        sessions = _split_names(os.environ.get("CONTROL_TERMINAL_SESSIONS", ""))
+        return cls(
+            token=token,
+            allowed_chat_ids=allowed_chat_ids,
+            session=os.environ.get(
+                "CONTROL_TERMINAL_SESSION", sessions[0] if sessions else DEFAULT_SESSION
+            ),
+            sessions=sessions,
+            auto_watch_seconds=_env_int("TELEGRAM_AUTO_WATCH_SECONDS", 2),
+            prompt_max_wait=_env_float("TELEGRAM_PROMPT_MAX_WAIT", 10.0),
+            capture_mode=os.environ.get("TELEGRAM_CAPTURE_MODE", "stream"),
+            scrollback_mb=_env_float("TELEGRAM_SCROLLBACK_MB", 8.0) or 8.0,
+            watch_mode=os.environ.get("TELEGRAM_WATCH_MODE", "live"),
+            rate_per_chat=_env_float("TELEGRAM_RATE_PER_CHAT", 1.0) or 1.0,
+            rate_global=_env_float("TELEGRAM_RATE_GLOBAL", 25.0) or 25.0,
+            queue_max=_env_int("TELEGRAM_QUEUE_MAX", 500) or 500,
+            document_threshold=_env_int("TELEGRAM_DOCUMENT_THRESHOLD", 12000) or 12000,
+            api_base=os.environ.get("TELEGRAM_API_BASE", DEFAULT_API_BASE),
+            state_dir=os.environ.get("CONTROL_TERMINAL_STATE_DIR", ""),
+        )
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name, "")
+    return int(value) if value.strip().isdigit() else default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(float(os.environ.get(name, "")), 0.0)
+    except ValueError:
+        return default
+
+
+def read_component_states(state_dir: str) -> list[dict[str, str]]:
+    """Reads the ``<component>.state`` key=value files the launcher maintains."""
+    states = []
+    try:
+        names = sorted(os.listdir(state_dir))
+    except OSError:
+        return []
+    for name in names:
+        if not name.endswith(".state"):
+            continue
+        try:
+            with open(os.path.join(state_dir, name), encoding="utf-8") as handle:
+                lines = handle.read().splitlines()
+        except OSError:
+            continue
+        state = dict(line.split("=", 1) for line in lines if "=" in line)
+        state.setdefault("name", name[: -len(".state")])
+        states.append(state)
+    return states
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(max(seconds, 0))
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days:
+        return f"{days}d{hours:02d}h"
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    return f"{minutes}m{seconds:02d}s"
+
+
+def format_health(health: dict[str, Any]) -> str:
+    """Renders a ``TelegramBridge.health`` snapshot as chat text."""
+    rows = [f"🩺 Bridge up {_format_duration(health['uptime_s'])}"]
+    for session in health["sessions"]:
+        state = "running" if session["running"] else "not running"
+        rows.append(
+            f"• {session['name']}: {state}, {session['capture']} capture, "
+            f"{session['log_lines']} lines logged, {session['prompts_pending']} prompt(s) pending"
+        )
+    rows.append(f"👀 Watchers: {len(health['watchers'])}")
+    rows.append(f"📬 Outbound: {health['outbox']}")
+    if health["components"]:
+        rows.append("⚙️ Components:")
+    now = health["time"]
+    for component in health["components"]:
+        status = component.get("status", "unknown")
+        detail = f"{component.get('name', '?')}: {status}"
+        if status == "running" and component.get("started_at", "").isdigit():
+            detail += f", up {_format_duration(now - int(component['started_at']))}"
+        detail += f", {component.get('restarts', '0')} restart(s)"
+        if component.get("last_exit"):
+            detail += f", last exit {component['last_exit']}"
+        rows.append(f"• {detail}")
+    return "\n".join(rows)
+
+
+def _split_names(value: str) -> tuple[str, ...]:
+    return tuple(name.strip() for name in value.split(",") if name.strip())
+
+
+def _parse_int(value: str, default: int) -> int:
+    value = value.replace(" ", "")
+    return int(value) if value.isdigit() else default
+
+
+# Commands that only press keys in the session: (keys, reply).
+KEY_COMMANDS: dict[str, tuple[tuple[str, ...], str]] = {
+    "/interrupt": (("C-c",), "⛔ Sent Ctrl+C to session '{session}'."),
+    "/clear": (("C-l",), "🧹 Terminal cleared."),
+    "/up": (("Up",), "⬆️ Sent Up arrow."),
+    "/down": (("Down",), "⬇️ Sent Down arrow."),
+    "/enter": (("Enter",), "✅ Sent Enter."),
+    "/esc": (("Escape",), "🚫 Sent Escape."),
+    "/yes": (("y", "Enter"), "👍 Sent 'y'."),
+    "/no": (("n", "Enter"), "👎 Sent 'n'."),
+}
+
+HELP_TEXT = (
+    "Control-Terminal bot commands:\n/status\n/tail [n | from-to]\n"
+    "/watch [seconds] [live|messages]\n/unwatch\n/queue\n/health\n/sessions\n/use <name>\n"
+    "/interrupt\n/clear\n\nNavigation:\n/up, /down, /enter, /esc\n/yes, /no\n\n"
+    "/prompt <text>\nAny plain text will be sent as prompt to {session}."
+)
+
+
+class TelegramBridge:
+    """Relays Telegram commands to one or more tmux sessions.
+
+    Each allowed chat controls one session at a time (the first one until it
+    picks another with /use) and keeps its own /watch subscriptions, keyed by
+    chat and session, each with its own interval and mode.
+    """
+
+    def __init__(self, config: BridgeConfig, client: BotApiClient) -> None:
+        self.config = config
+        self.client = client
+        self.outbox = OutboundQueue(
+            client,
+            chat_rate=config.rate_per_chat,
+            global_rate=config.rate_global,
+            max_pending=config.queue_max,
+        )
+        self.outbox_worker: asyncio.Task[None] | None = None
+        self.sessions = {name: AgentSession(name) for name in config.session_names}
+        self.selected: dict[str, str] = {}
+        # Stopped watchers stay here so a chat's interval and mode are kept.
+        self.watchers: dict[tuple[str, str], Watcher] = {}
+        self.offset = 0
+        self.live_messages: dict[tuple[str, str], LiveMessage] = {}
+        self.started_at = time.time()
+        self.status_server: asyncio.AbstractServer | None = None
+
+    async def api(
+        self,
+        method: str,
+        params: dict[str, Any],
+        *,
+        coalesce: str | None = None,
+        files: dict[str, tuple[str, bytes, str]] | None = None,
+    ) -> dict[str, Any] | None:
+        """Delivers a Bot API write through the outbound queue (None if dropped)."""
+        return await self.outbox.call(method, params, coalesce=coalesce, files=files)
+
+    def post_message(
+        self, chat_id: str, text: str
+    ) -> list[asyncio.Future[dict[str, Any] | None]]:
+        """Queues text in full without waiting for delivery.
+
+        The text is split on line boundaries, or sent as a document when large.
+        The update loop replies this way so a rate-limited chat cannot hold up
+        commands from other chats.
+        """
+        if len(text) > self.config.document_threshold:
+            return [self._submit_document(chat_id, text)]
+        # The queue keeps per-chat order, so every chunk can be queued at once.
+        return [
+            self.outbox.submit("sendMessage", {"chat_id": chat_id, "text": chunk})
+            for chunk in split_message(text)
+        ]
+
+    async def send_message(self, chat_id: str, text: str) -> bool:
+        """Like ``post_message``, but waits until Telegram accepted every part."""
+        replies = await asyncio.gather(*self.post_message(chat_id, text))
+        return all(reply and reply.get("ok") for reply in replies)
+
+    def _submit_document(
+        self, chat_id: str, text: str
+    ) -> asyncio.Future[dict[str, Any] | None]:
+        """Queues text as one gzip-compressed .txt document."""
+        content = gzip.compress(text.encode("utf-8"))
+        session = self.session_for(chat_id).name
+        filename = f"{session}-{time.strftime('%Y%m%d-%H%M%S')}.txt.gz"
+        caption = (
+            f"📎 {text.count(chr(10)) + 1} lines, {len(text) // 1024} KiB of output "
+            f"(gzip, {len(content) // 1024 + 1} KiB)"
+        )
+        return self.outbox.submit(
+            "sendDocument",
+            {"chat_id": chat_id, "caption": caption},
+            files={"document": (filename, content, "application/gzip")},
+        )
+
+    def session_for(self, chat_id: str) -> AgentSession:
+        """The session a chat currently controls."""
+        name = self.selected.get(chat_id)
+        if name in self.sessions:
+            return self.sessions[name]
+        return next(iter(self.sessions.values()))
+
+    def find_session(self, name: str) -> AgentSession | None:
+        """Looks a session up by full name or by its ``-<agent>`` suffix."""
+        if name in self.sessions:
+            return self.sessions[name]
+        matches = [agent for key, agent in self.sessions.items() if key.endswith(f"-{name}")]
+        return matches[0] if len(matches) == 1 else None
+
+    async def start_capture(self, agent: AgentSession) -> None:
+        if self.config.capture_mode == "stream":
+            await agent.start_capture(int(self.config.scrollback_mb * 1024 * 1024))
+
+    # ------------------------------------------------------------------
+    # /watch stream
+    # ------------------------------------------------------------------
+    def start_stream(
+        self, agent: AgentSession, chat_id: str, interval: int, mode: str | None = None
+    ) -> None:
+        key = (chat_id, agent.name)
+        if key in self.watchers:
+            self.watchers[key].stop()
+        watcher = Watcher(chat_id, agent, interval, mode or self.config.watch_mode)
+        watcher.task = asyncio.create_task(
+            self._stream(agent, chat_id, watcher.interval, watcher.mode)
+        )
+        self.watchers[key] = watcher
+
+    def ensure_stream_for_chat(self, agent: AgentSession, chat_id: str) -> None:
+        watcher = self.watchers.get((chat_id, agent.name))
+        if watcher is None:
+            self.start_stream(agent, chat_id, self.config.auto_watch_seconds)
+        elif not watcher.running():
+            self.start_stream(agent, chat_id, watcher.interval, watcher.mode)
+
+    def watcher_count(self, agent: AgentSession) -> int:
+        return sum(
+            1 for watcher in self.watchers.values() if watcher.agent is agent and watcher.running()
+        )
+
+    async def _stream(self, agent: AgentSession, chat_id: str, interval: int, mode: str) -> None:
+        if mode == "live":
+            await self.send_message(
+                chat_id,
+                f"▶️ Live view of '{agent.name}' started (updated in place about every "
+                f"{max(interval, LIVE_EDIT_MIN_INTERVAL_S):g}s). Use /unwatch to stop.",
+            )
+            live = self.live_messages.setdefault(
+                (chat_id, agent.name), LiveMessage(self, chat_id)
+            )
+            live.rollover()
+            if agent.capture is not None:
+                await self._follow_log_live(agent, agent.capture, live, interval)
+            else:
+                await self._poll_live(agent, live, interval)
+            return
+
+        await self.send_message(
+            chat_id,
+            f"▶️ Live stream of '{agent.name}' started (about every {interval}s). "
+            "Use /unwatch to stop.",
+        )
+        if agent.capture is not None:
+            await self._follow_log(agent, agent.capture, chat_id, interval)
+            return
+
+        previous = ""
+        while True:
+            current = await agent.shared_tail(40) or "(no output yet)"
+            if current != previous:
+                await self.send_message(chat_id, f"📡 {agent.name} live view:\n{current}")
+                previous = current
+            await asyncio.sleep(interval)
+
+    async def _follow_log(
+        self, agent: AgentSession, capture: PaneCapture, chat_id: str, interval: int
+    ) -> None:
+        """Sends only lines newer than the last sequence delivered to the chat.
+
+        Updates are handed to the outbound queue without waiting, so while the
+        chat is rate limited consecutive updates merge into one message. If
+        Telegram never accepts one, the cursor rewinds and the chat catches up
+        with the missed lines still in scrollback. A rewind never goes back past
+        the newest line Telegram accepted, so no line is sent twice.
+        """
+        log = capture.log
+        header = f"📡 {agent.name} live view:"
+        cursor = max(log.last_seq - WATCH_CONTEXT_LINES, 0)
+        delivered = 0
+        sent_partial = ""
+        in_flight: list[tuple[asyncio.Future[dict[str, Any] | None], int, int]] = []
+        seen = -1
+        while True:
+            # Sleep until the pane prints something; the interval below then
+            # only rate-limits how often a busy pane is sent.
+            version = await capture.wait_for_output(seen, CAPTURE_RECHECK_S)
+            if version == seen:
+                await capture.ensure_attached()
+                continue
+            seen = version
+
+            rewind: int | None = None
+            while in_flight and in_flight[0][0].done():
+                # A chat's requests complete in order, so this is submit order.
+                future, before, through = in_flight.pop(0)
+                reply = future.result()
+                if reply and reply.get("ok"):
+                    delivered = max(delivered, through)
+                elif rewind is None:
+                    rewind = before
+            if rewind is not None:
+                # Later updates still queued are superseded by the resend.
+                for future, _, _ in in_flight:
+                    future.cancel()
+                in_flight.clear()
+                cursor = max(min(cursor, rewind), delivered, log.first_seq - 1)
+                sent_partial = ""
+
+            rows: list[str] = []
+            if cursor + 1 < log.first_seq:
+                rows.append(f"… {log.first_seq - cursor - 1} lines dropped from scrollback")
+            last = cursor
+            size = 0
+            backlog = False
+            for seq, line in log.lines(cursor + 1):
+                size += len(line) + 1
+                if size > MAX_MESSAGE_CHARS - 200 and rows:
+                    # Leave the rest for the next round instead of truncating.
+                    backlog = True
+                    break
+                rows.append(line)
+                last = seq
+            partial = "" if backlog else log.partial
+            if partial.strip() and partial != sent_partial:
+                rows.append(partial)
+
+            text = "\n".join(rows).strip("\n")
+            if text.strip():
+                future = self.outbox.submit(
+                    "sendMessage",
+                    {"chat_id": chat_id, "text": f"{header}\n{text}"},
+                    coalesce=f"watch:{agent.name}",
+                )
+                in_flight.append((future, cursor, last))
+                sent_partial = partial
+            cursor = last
+            if backlog or in_flight:
+                seen = -1
+            await asyncio.sleep(interval)
+
+    async def _follow_log_live(
+        self, agent: AgentSession, capture: PaneCapture, live: LiveMessage, interval: int
+    ) -> None:
+        """Appends new log lines to the chat's live message, editing it in place.
+
+        Every change that arrives while an edit is pending is folded into the
+        next edit. When the body would overflow, the message is filled up,
+        frozen and the view continues in a new message.
+        """
+        log = capture.log
+        header = f"📡 {agent.name} live view:"
+        delay = max(interval, LIVE_EDIT_MIN_INTERVAL_S)
+        cursor = max(log.last_seq - WATCH_CONTEXT_LINES, 0)
+        body: list[str] = []
+        seen = -1
+        while True:
+            version = await capture.wait_for_output(seen, CAPTURE_RECHECK_S)
+            if version == seen:
+                await capture.ensure_attached()
+                continue
+            seen = version
+
+            rows = list(body)
+            size = sum(len(row) + 1 for row in rows)
+            if cursor + 1 < log.first_seq:
+                rows.append(f"… {log.first_seq - cursor - 1} lines dropped from scrollback")
+            last = cursor
+            overflow = False
+            for seq, line in log.lines(cursor + 1):
+                line = line[:LIVE_BODY_CHARS]
+                if size + len(line) + 1 > LIVE_BODY_CHARS and rows:
+                    overflow = True
+                    break
+                rows.append(line)
+                size += len(line) + 1
+                last = seq
+
+            partial = "" if overflow else log.partial
+            shown = [*rows, partial] if partial.strip() else rows
+            text = "\n".join(shown).strip("\n") or "(no output yet)"
+            if await live.show(f"{header}\n{text}"):
+                cursor = last
+                body = rows
+                if overflow:
+                    live.rollover()
+                    body = []
+                    seen = -1
+            else:
+                seen = -1
+            await asyncio.sleep(delay)
+
+    async def _poll_live(self, agent: AgentSession, live: LiveMessage, interval: int) -> None:
+        header = f"📡 {agent.name} live view:"
+        while True:
+            current = await agent.shared_tail(40) or "(no output yet)"
+            await live.show(f"{header}\n{current[-LIVE_BODY_CHARS:]}")
+            await asyncio.sleep(max(interval, LIVE_EDIT_MIN_INTERVAL_S))
+
+    def stop_streams_for_chat(self, chat_id: str) -> bool:
+        """Stops every stream delivering to the chat; False if none was running."""
+        stopped = False
+        for (watcher_chat, session), watcher in self.watchers.items():
+            if watcher_chat == chat_id and watcher.running():
+                watcher.stop()
+                stopped = True
+                live = self.live_messages.get((chat_id, session))
+                if live is not None:
+                    live.unpin()
+        return stopped
+
+    # ------------------------------------------------------------------
+    # Message handling
+    # ------------------------------------------------------------------
+    async def handle_message(self, chat_id: str, text: str) -> None:
+        if chat_id not in self.config.allowed_chat_ids:
+            self.post_message(chat_id, "Unauthorized chat_id.")
+            return
+
+        command, _, argument = text.partition(" ")
+        command = command.split("@", 1)[0] if command.startswith("/") else command
+        agent = self.session_for(chat_id)
+        session = agent.name
+
+        if command in ("/start", "/help"):
+            self.post_message(chat_id, HELP_TEXT.format(session=session))
+        elif command == "/status":
+            if await agent.tmux.exists():
+                self.post_message(chat_id, f"✅ Session '{session}' is running.")
+            else:
+                self.post_message(chat_id, f"❌ Session '{session}' is not running.")
+        elif command == "/sessions" or (command == "/use" and not argument.strip()):
+            await self.send_sessions(chat_id)
+        elif command == "/use":
+            target = self.find_session(argument.strip())
+            if target is None:
+                self.post_message(
+                    chat_id,
+                    f"❌ Unknown session '{argument.strip()}'. Use /sessions to list them.",
+                )
+                return
+            self.selected[chat_id] = target.name
+            self.post_message(chat_id, f"🎯 Now controlling session '{target.name}'.")
+        elif command in KEY_COMMANDS:
+            keys, reply = KEY_COMMANDS[command]
+            await agent.tmux.send_keys(*keys)
+            self.post_message(chat_id, reply.format(session=session))
+        elif command == "/watch":
+            words = argument.split()
+            mode = next((word for word in words if word in WATCH_MODES), None)
+            seconds = next((word for word in words if word.isdigit()), "")
+            interval = min(max(_parse_int(seconds, self.config.auto_watch_seconds), 1), 10)
+            self.start_stream(agent, chat_id, interval, mode)
+        elif command == "/queue":
+            self.post_message(chat_id, f"📬 Outbound queue: {self.outbox.summary()}")
+        elif command == "/health":
+            self.post_message(chat_id, format_health(await self.health()))
+        elif command == "/unwatch":
+            if self.stop_streams_for_chat(chat_id):
+                self.post_message(chat_id, "⏹️ Live stream stopped.")
+            else:
+                self.post_message(chat_id, "ℹ️ Live stream is not running.")
+        elif command == "/tail":
+            await self.send_tail(agent, chat_id, argument)
+        elif command == "/prompt":
+            prompt_text = argument
+            if not prompt_text:
+                self.post_message(chat_id, "Usage: /prompt your instruction")
+                return
+            await self.dispatch_prompt(agent, chat_id, prompt_text)
+        else:
+            await self.dispatch_prompt(agent, chat_id, text)
+
+    async def health(self) -> dict[str, Any]:
+        """Snapshot of the bridge and of the launcher components around it."""
+        now = time.time()
+        sessions = []
+        for agent in self.sessions.values():
+            sessions.append(
+                {
+                    "name": agent.name,
+                    "running": await agent.tmux.exists(),
+                    "capture": "stream" if agent.capture is not None else "poll",
+                    "log_lines": agent.capture.log.last_seq if agent.capture is not None else 0,
+                    "prompts_pending": agent.prompt_queue.qsize() + agent.prompt_busy,
+                }
+            )
+        watchers = [
+            {"chat_id": w.chat_id, "session": w.agent.name, "interval": w.interval, "mode": w.mode}
+            for w in self.watchers.values()
+            if w.running()
+        ]
+        return {
+            "time": now,
+            "uptime_s": now - self.started_at,
+            "sessions": sessions,
+            "watchers": watchers,
+            "outbox": self.outbox.summary(),
+            "components": read_component_states(self.config.state_dir)
+            if self.config.state_dir
+            else [],
+        }
+
+    async def start_status_server(self) -> None:
+        """Serves ``health()`` as one JSON document per connection on a unix socket."""
+        if not self.config.state_dir:
+            return
+        path = os.path.join(self.config.state_dir, STATUS_SOCKET_NAME)
+        if os.path.exists(path):
+            os.unlink(path)
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                writer.write(json.dumps(await self.health()).encode("utf-8") + b"\n")
+                await writer.drain()
+            finally:
+                writer.close()
+
+        try:
+            self.status_server = await asyncio.start_unix_server(handle, path)
+            os.chmod(path, 0o600)
+        except OSError as exc:
+            logger.warning("Status socket %s unavailable: %s", path, exc)
+
+    async def stop_status_server(self) -> None:
+        if self.status_server is None:
+            return
+        self.status_server.close()
+        await self.status_server.wait_closed()
+        self.status_server = None
+        path = os.path.join(self.config.state_dir, STATUS_SOCKET_NAME)
+        if os.path.exists(path):
+            os.unlink(path)
+
+    async def send_sessions(self, chat_id: str) -> None:
+        current = self.session_for(chat_id)
+        rows = []
+        for agent in self.sessions.values():
+            state = "running" if await agent.tmux.exists() else "not running"
+            if watchers := self.watcher_count(agent):
+                state += f", watched by {watchers} chat(s)"
+            if agent.prompt_busy or agent.prompt_queue.qsize():
+                state += f", {agent.prompt_queue.qsize() + agent.prompt_busy} prompt(s) pending"
+            marker = "▶" if agent is current else "•"
+            rows.append(f"{marker} {agent.name} ({state})")
+        self.post_message(
+            chat_id, "🗂️ Sessions:\n" + "\n".join(rows) + "\n\nSwitch with /use <name>."
+        )
+
+    async def send_tail(self, agent: AgentSession, chat_id: str, argument: str) -> None:
+        """Answers ``/tail [n]`` and, with the streamed log, ``/tail <from>-<to>``."""
+        if agent.capture is None:
+            lines = min(_parse_int(argument, 40), 200)
+            self.post_message(chat_id, await agent.tail_output(lines) or "(no output yet)")
+            return
+
+        await agent.capture.ensure_attached()
+        log = agent.capture.log
+        match = TAIL_RANGE_RE.match(argument.replace(" ", ""))
+        if match is None:
+            lines = min(_parse_int(argument, 40), MAX_TAIL_LINES)
+            self.post_message(chat_id, agent.capture.tail(lines) or "(no output yet)")
+            return
+
+        start, end = int(match.group(1)), int(match.group(2))
+        end = min(end, start + MAX_TAIL_LINES - 1)
+        rows = [line for _, line in log.lines(start, end)]
+        if not rows:
+            self.post_message(
+                chat_id, f"ℹ️ Scrollback holds lines #{log.first_seq}-#{log.last_seq}."
+            )
+            return
+        first = max(start, log.first_seq)
+        header = f"📜 lines #{first}-#{first + len(rows) - 1} of #{log.last_seq}:"
+        self.post_message(chat_id, header + "\n" + "\n".join(rows))
+
+    async def dispatch_prompt(self, agent: AgentSession, chat_id: str, prompt_text: str) -> None:
+        if not await agent.tmux.exists():
+            self.post_message(
+                chat_id,
+                f"❌ Session '{agent.name}' is not running. Start control-terminal first.",
+            )
+            return
+
+        pending = agent.prompt_queue.qsize() + (1 if agent.prompt_busy else 0)
+        agent.prompt_queue.put_nowait((chat_id, prompt_text))
+        if pending:
+            self.post_message(chat_id, f"⏳ Prompt queued ({pending} ahead).")
+
+    async def _prompt_worker(self, agent: AgentSession) -> None:
+        while True:
+            chat_id, prompt_text = await agent.prompt_queue.get()
+            agent.prompt_busy = True
+            try:
+                await self._deliver_prompt(agent, chat_id, prompt_text)
+            except Exception:
+                logger.exception("Prompt delivery to %s failed", agent.name)
+            finally:
+                agent.prompt_busy = False
+                agent.prompt_queue.task_done()
+
+    async def _deliver_prompt(self, agent: AgentSession, chat_id: str, prompt_text: str) -> None:
+        baseline = await agent.tail_output(PROMPT_REPLY_LINES)
+        await agent.tmux.send_keys(prompt_text, literal=True)
+        # Give the agent's line editor a moment to register the text before Enter.
+        await asyncio.sleep(0.5)
+        await agent.tmux.send_keys("Enter")
+
+        if agent.capture is not None:
+            response = await self._wait_for_capture_settle(agent, agent.capture)
+        else:
+            response = await agent.tmux.wait_for_output(
+                baseline, PROMPT_REPLY_LINES, self.config.prompt_max_wait
+            )
+        if len(self.sessions) > 1 and response:
+            response = f"[{agent.name}]\n{response}"
+        await self.send_message(chat_id, response or "Prompt sent.")
+        self.ensure_stream_for_chat(agent, chat_id)
+
+    async def _wait_for_capture_settle(self, agent: AgentSession, capture: PaneCapture) -> str:
+        """Event-driven counterpart of TmuxSession.wait_for_output."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.config.prompt_max_wait
+        seen = capture.version
+        changed = False
+        while (remaining := deadline - loop.time()) > 0:
+            version = await capture.wait_for_output(
+                seen, min(remaining, PROMPT_SETTLE_S) if changed else remaining
+            )
+            if version == seen and changed:
+                break
+            changed = changed or version != seen
+            seen = version
+        return await agent.tmux.capture(PROMPT_REPLY_LINES)
+
+    # ------------------------------------------------------------------
+    # Update loop
+    # ------------------------------------------------------------------
+    async def run(self) -> None:
+        me = await self.client.call("getMe")
+        if not me.get("ok"):
+            raise TokenRejected(f"getMe rejected: {me.get('description', 'unknown error')}")
+
+        for agent in self.sessions.values():
+            await self.start_capture(agent)
+            agent.prompt_worker = asyncio.create_task(self._prompt_worker(agent))
+        self.outbox_worker = asyncio.create_task(self.outbox.run())
+        await self.start_status_server()
+        print(
+            "🤖 Telegram bridge is running. Send prompts to your bot from "
+            f"chat_id={', '.join(self.config.allowed_chat_ids)}",
+            flush=True,
+        )
+        if len(self.sessions) > 1:
+            print(f"🗂️ Sessions: {', '.join(self.sessions)}", flush=True)
+
+        while True:
+            try:
+                data = await self.client.call(
+                    "getUpdates",
+                    {
+                        "offset": self.offset,
+                        "timeout": LONG_POLL_TIMEOUT_S,
+                        "allowed_updates": ["message"],
+                    },
+                    timeout=LONG_POLL_TIMEOUT_S + REQUEST_TIMEOUT_S,
+                )
+            except BotApiError as exc:
+                logger.warning("%s", exc)
+                await asyncio.sleep(2)
+                continue
+
+            if not data.get("ok"):
+                await asyncio.sleep(2)
+                continue
+
+            for update in data.get("result", []):
+                update_id = update.get("update_id")
+                if update_id is None:
+                    continue
+                self.offset = update_id + 1
+                message = update.get("message") or {}
+                chat_id = (message.get("chat") or {}).get("id")
+                if chat_id is None:
+                    continue
+                text = (message.get("text") or "").replace("\n", " ")
+                await self.handle_message(str(chat_id), text)
+
+
+async def _amain(config: BridgeConfig) -> int:
+    client = BotApiClient(config.token, config.api_base)
+    bridge = TelegramBridge(config, client)
+    main_task = asyncio.current_task()
+    assert main_task is not None
+    # control-terminal's cleanup sends SIGTERM; unwind so the pipe is detached.
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, main_task.cancel)
+    try:
+        await bridge.run()
+    except TokenRejected as exc:
+        print(f"⚠️ Telegram {exc}. Disabling Telegram control.", flush=True)
+        return EXIT_DISABLED
+    except BotApiError as exc:
+        # Likely transient (e.g. no network yet at boot): exit non-zero so the
+        # supervisor restarts the bridge with backoff.
+        print(f"⚠️ Telegram getMe failed ({exc}); exiting for a restart.", flush=True)
+        return 1
+    except asyncio.CancelledError:
+        return 0
+    finally:
+        # Another SIGTERM during teardown cancels this task again; shielding
+        # lets the teardown finish so every capture FIFO is removed.
+        teardown = asyncio.ensure_future(_shutdown(bridge, client))
+        while not teardown.done():
+            with contextlib.suppress(asyncio.CancelledError):
+                await asyncio.shield(teardown)
+    return 0
+
+
+async def _shutdown(bridge: TelegramBridge, client: BotApiClient) -> None:
+    for watcher in bridge.watchers.values():
+        watcher.stop()
+    for agent in bridge.sessions.values():
+        await agent.close()
+    if bridge.outbox_worker is not None:
+        bridge.outbox_worker.cancel()
+    await bridge.stop_status_server()
+    await client.close()
+
+
+def print_status(socket_path: str) -> int:
+    """Prints the health summary served on a bridge status socket."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5)
+            sock.connect(socket_path)
+            data = b""
+            while chunk := sock.recv(65536):
+                data += chunk
+    except OSError as exc:
+        print(f"⚠️ Bridge status unavailable at {socket_path}: {exc}")
+        return 1
+    print(format_health(json.loads(data)))
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="control-terminal Telegram bridge")
+    parser.add_argument("--api-base", help="Bot API base URL (overrides TELEGRAM_API_BASE)")
+    parser.add_argument(
+        "--session",
+        help="tmux session, or a comma-separated list to multiplex "
+        "(overrides CONTROL_TERMINAL_SESSION[S])",
+    )
+    parser.add_argument(
+        "--status", metavar="SOCKET", help="print the health of the bridge serving SOCKET and exit"
+    )
+    args = parser.parse_args()
+
+    if args.status:
+        sys.exit(print_status(args.status))
+
+    logging.basicConfig(level=logging.INFO, format="[bridge] %(levelname)s %(message)s")
+
+    try:
+        config = BridgeConfig.from_env()
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.api_base:
+        config = replace(config, api_base=args.api_base)
+    if args.session and (sessions := _split_names(args.session)):
+        config = replace(config, session=sessions[0], sessions=sessions)
+
+    try:
+        sys.exit(asyncio.run(_amain(config)))
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()